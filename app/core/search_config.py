@@ -4,11 +4,22 @@ Search Configuration - COMPLETE FIXED VERSION
 
 import os
 import random
+import re
 
 # === BROWSERLESS CONFIGURATION ===
 BROWSERLESS_URL = os.getenv("BROWSERLESS_URL", "ws://browserless:3000")
 DEBUG_DUMPS_DIR = "/app/debug_dumps"
 
+# === REQUEST BLOCKING ===
+# Analytics and ad requests, aborted in every scraping context. Patterns (not a "**/*"
+# handler) are matched by the Playwright driver, so other requests are never paused.
+TRACKER_URL_RE = re.compile(
+    r"(doubleclick\.net|googletagmanager\.com|google-analytics\.com|googlesyndication\.com"
+    r"|facebook\.net|hotjar\.com|criteo\.(com|net)|taboola\.com|outbrain\.com)"
+)
+# Images and fonts, aborted when only the HTML is needed
+STATIC_ASSET_URL_RE = re.compile(r"\.(png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|otf)(\?|$)", re.IGNORECASE)
+
 # === PROXY CONFIGURATION ===
 # NOTE: All free proxies tested are non-functional. Direct connections will be used.
 # Add working proxies here when available.
@@ -253,3 +264,51 @@ COOKIE_ACCEPT_SELECTORS = [
     "button:has-text('Accepter')",
     "button:has-text('Refuser')",
 ]
+
+# === POPUP HANDLING ===
+# Playwright's ":has-text()" is not CSS: split it into a base selector, the text to match
+# (case-insensitive substring, like Playwright) and an optional descendant selector
+_HAS_TEXT_RE = re.compile(r"^(.*?):has-text\('(.+?)'\)(.*)$")
+
+
+def split_popup_selector(selector: str) -> tuple[str, str | None, str | None]:
+    match = _HAS_TEXT_RE.match(selector)
+    if not match:
+        return selector, None, None
+    base, text, descendant = match.groups()
+    return base or "*", text.lower(), descendant.strip() or None
+
+
+# Clicks the first visible, enabled match of every popup selector, in priority order,
+# in a single round trip; returns the selectors that were clicked
+CLOSE_POPUPS_SCRIPT = """
+(parts) => {
+    const usable = (el) => {
+        const r = el.getBoundingClientRect();
+        if (!r.width || !r.height || el.disabled) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const clicked = [];
+    for (const [base, text, descendant] of parts) {
+        let candidates;
+        try {
+            candidates = Array.from(document.querySelectorAll(base));
+        } catch (e) {
+            continue;
+        }
+        if (text !== null) {
+            candidates = candidates.filter(el => (el.textContent || '').toLowerCase().includes(text));
+            if (descendant !== null) {
+                candidates = candidates.flatMap(el => Array.from(el.querySelectorAll(descendant)));
+            }
+        }
+        const target = candidates.find(usable);
+        if (target) {
+            target.click();
+            clicked.push(text === null ? base : `${base}:has-text('${text}')`);
+        }
+    }
+    return clicked;
+}
+"""
@@ -27,7 +27,7 @@ from app.routers import (
     amazon,
 )
 from app.services.scheduler_service import scheduled_refresh, scheduler
-from app.services import auth_service, search_service, seed_enseignes
+from app.services import auth_service, bonial_scraper, search_service, seed_enseignes
 from app.services.scheduler import start_scheduler as start_catalog_scheduler, stop_scheduler as stop_catalog_scheduler
 from app.services.amazon_scraper_service import amazon_scraper_service
 from app.services.improved_search_service import improved_search_service
@@ -175,6 +175,7 @@ async def lifespan(app: FastAPI):
     scheduler.shutdown(wait=True)
     stop_catalog_scheduler()
     await amazon_scraper_service.shutdown()
+    await bonial_scraper.shutdown()
     # await improved_search_service.shutdown()
     # TrackingScraperService shutdown is handled on-demand
     logger.info("Application shutdown complete")
@@ -8,15 +8,25 @@ import logging
 import os
 import random
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from urllib.parse import quote_plus
 
+import aiofiles
 from bs4 import BeautifulSoup
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from pydantic import BaseModel, Field
 
+from app.core.search_config import (
+    CLOSE_POPUPS_SCRIPT,
+    STATIC_ASSET_URL_RE,
+    TRACKER_URL_RE,
+    split_popup_selector,
+)
+
 logger = logging.getLogger(__name__)
 
 BROWSERLESS_URL = os.getenv("BROWSERLESS_URL", "ws://browserless:3000")
@@ -43,6 +53,44 @@ AMAZON_POPUP_SELECTORS = [
     ".a-button-close",  # Generic Amazon close button
     "[data-action='a-modal-close']",
 ]
+AMAZON_POPUP_SELECTOR_PARTS = [split_popup_selector(selector) for selector in AMAZON_POPUP_SELECTORS]
+
+# In-page extraction of search result cards (argument: max number of cards).
+# Returns raw strings only; numeric parsing stays in the parse_* helpers.
+EXTRACT_CARDS_SCRIPT = """
+(maxResults) => {
+    let cards = document.querySelectorAll('div[data-component-type="s-search-result"]');
+    if (cards.length === 0) {
+        cards = document.querySelectorAll('div[data-asin][data-index]');
+    }
+    const firstText = (card, selectors) => {
+        for (const selector of selectors) {
+            const text = card.querySelector(selector)?.innerText?.trim();
+            if (text) return text;
+        }
+        return null;
+    };
+    return Array.from(cards).slice(0, maxResults).map((card) => {
+        const ratingElem = card.querySelector('[aria-label*="étoile"], [aria-label*="star"], i.a-icon-star span');
+        const priceTexts = ['.a-price .a-offscreen', '.a-price-whole', 'span.a-price span.a-offscreen', '.a-price']
+            .map((selector) => card.querySelector(selector)?.textContent)
+            .filter(Boolean);
+        return {
+            asin: card.getAttribute('data-asin'),
+            sponsored: !!card.querySelector('[data-component-type="sp-sponsored-result"]'),
+            title: firstText(card, ['h2 a span', 'h2 span', 'h2.s-line-clamp-2 span', 'h2']),
+            href: card.querySelector("h2 a, a[href*='/dp/']")?.getAttribute('href') ?? null,
+            priceTexts: priceTexts,
+            originalPriceText: card.querySelector('.a-price.a-text-price .a-offscreen')?.textContent ?? null,
+            ratingText: ratingElem ? (ratingElem.getAttribute('aria-label') || ratingElem.innerText) : null,
+            reviewsText: firstText(card, ["span.s-underline-text", "span[aria-label*='évaluation']"]),
+            img: card.querySelector('img.s-image, img')?.getAttribute('src') ?? null,
+            prime: !!card.querySelector('[aria-label*="Prime"], i.a-icon-prime'),
+            unavailable: !!card.querySelector('[aria-label*="Indisponible"]'),
+        };
+    });
+}
+"""
 
 
 # ============================================================================
@@ -69,17 +117,24 @@ class AmazonProduct(BaseModel):
 # PARSING HELPERS
 # ============================================================================
 
+_PRICE_TRANS = str.maketrans({" ": None, "\xa0": None, "€": None, ",": "."})
+_PRICE_RE = re.compile(r"(\d+\.?\d*)")
+_RATING_RE = re.compile(r"(\d+[,.]\d+)")
+
 
 def parse_amazon_price(price_text: str) -> float | None:
     """Parse Amazon price formats"""
     if not price_text:
         return None
 
-    cleaned = price_text.strip().replace("€", "").replace("EUR", "").strip()
-    cleaned = cleaned.replace(" ", "").replace("\xa0", "")
-    cleaned = cleaned.replace(",", ".")
+    # Single pass: drop currency/thousands separators, comma -> dot
+    cleaned = price_text.translate(_PRICE_TRANS).replace("EUR", "")
+
+    # Fast path for the common "12.99" shape, regex only for ranges/noise
+    if cleaned[:1].isdecimal() and cleaned.replace(".", "", 1).isdecimal():
+        return float(cleaned)
 
-    match = re.search(r"(\d+\.?\d*)", cleaned)
+    match = _PRICE_RE.search(cleaned)
     if match:
         try:
             return float(match.group(1))
@@ -93,7 +148,7 @@ def parse_rating(rating_text: str) -> float | None:
     if not rating_text:
         return None
 
-    match = re.search(r"(\d+[,.]\d+)", rating_text)
+    match = _RATING_RE.search(rating_text)
     if match:
         try:
             return float(match.group(1).replace(",", "."))
@@ -269,24 +324,31 @@ class AmazonScraperService:
             Object.defineProperty(navigator, 'deviceMemory', { get: () => 8 });
         """)
 
-        await context.route("**/*", lambda route: route.continue_())
+        # Search results are read from the DOM: trackers, images and fonts are not needed
+        await context.route(TRACKER_URL_RE, lambda route: route.abort())
+        await context.route(STATIC_ASSET_URL_RE, lambda route: route.abort())
         return context
 
     @staticmethod
     async def _simulate_human_behavior(page: Page):
         """Perform subtle human-like interactions"""
         try:
-            # Random mouse movements
+            # Random mouse movements: real input events, since synthetic ones are flagged untrusted
             for _ in range(3):
                 x = random.randint(100, 800)
                 y = random.randint(100, 600)
                 await page.mouse.move(x, y, steps=10)
                 await asyncio.sleep(random.uniform(0.1, 0.3))
 
-            # Subtle scroll
-            await page.evaluate("window.scrollBy(0, window.innerHeight / 4)")
-            await asyncio.sleep(random.uniform(0.5, 1.0))
-            await page.evaluate("window.scrollBy(0, -window.innerHeight / 5)")
+            # Subtle scroll, down then back up after a pause, in a single round trip
+            await page.evaluate(
+                """async (pause) => {
+                    window.scrollBy(0, window.innerHeight / 4);
+                    await new Promise(resolve => setTimeout(resolve, pause));
+                    window.scrollBy(0, -window.innerHeight / 5);
+                }""",
+                random.randint(500, 1000),
+            )
         except Exception as e:
             logger.warning(f"Failed to simulate human behavior: {e}")
 
@@ -294,14 +356,13 @@ class AmazonScraperService:
     async def _handle_popups(page: Page):
         """Close Amazon popups/cookies"""
         logger.info("Handling Amazon popups...")
-        for selector in AMAZON_POPUP_SELECTORS:
-            try:
-                if await page.locator(selector).count() > 0:
-                    logger.info(f"Found popup: {selector}")
-                    await page.locator(selector).first.click(timeout=2000)
-                    await page.wait_for_timeout(1000)
-            except Exception:
-                pass
+        try:
+            clicked = await page.evaluate(CLOSE_POPUPS_SCRIPT, AMAZON_POPUP_SELECTOR_PARTS)
+            if clicked:
+                logger.info(f"Closed popups: {clicked}")
+                await page.wait_for_timeout(1000)
+        except Exception:
+            pass
 
         try:
             await page.keyboard.press("Escape")
@@ -311,88 +372,49 @@ class AmazonScraperService:
     @classmethod
     async def _extract_products_from_visible_dom(cls, page: Page, max_results: int) -> list["AmazonProduct"]:
         """
-        FALLBACK: Extract products using Playwright's visible DOM methods.
+        FALLBACK: Extract products from the rendered DOM with a single page.evaluate call.
         This works even when HTML parsing fails because it reads directly from rendered elements.
         """
         logger.info("🔄 Attempting fallback extraction from visible DOM...")
         products = []
 
         try:
-            # First, save a debug screenshot and HTML for analysis
-            try:
-                await page.screenshot(path="/tmp/amazon_dom_debug.png")
-                html = await page.content()
-                with open("/tmp/amazon_dom_debug.html", "w", encoding="utf-8") as f:
-                    f.write(html)
-                logger.info("📸 Saved debug screenshot and HTML to /tmp/amazon_dom_debug.*")
-            except Exception as e:
-                logger.warning(f"Could not save debug files: {e}")
-
-            # Find all product cards using Playwright locators
-            product_cards = page.locator('div[data-component-type="s-search-result"]')
-            count = await product_cards.count()
-
-            if count == 0:
-                # Try alternative selector
-                product_cards = page.locator("div[data-asin][data-index]")
-                count = await product_cards.count()
+            # First, save a debug screenshot and HTML for analysis (only when debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                try:
+                    await page.screenshot(path="/tmp/amazon_dom_debug.png")
+                    html = await page.content()
+                    async with aiofiles.open("/tmp/amazon_dom_debug.html", "w", encoding="utf-8") as f:
+                        await f.write(html)
+                    logger.debug("📸 Saved debug screenshot and HTML to /tmp/amazon_dom_debug.*")
+                except Exception as e:
+                    logger.warning(f"Could not save debug files: {e}")
 
-            logger.info(f"📦 Found {count} visible product cards")
+            # Extract every card field in a single round-trip: only small strings cross CDP
+            cards = await page.evaluate(EXTRACT_CARDS_SCRIPT, max_results)
+            logger.info(f"📦 Found {len(cards)} visible product cards")
 
-            for idx in range(min(count, max_results)):
+            for idx, card in enumerate(cards):
                 try:
-                    card = product_cards.nth(idx)
-
-                    # Get ASIN
-                    asin = await card.get_attribute("data-asin")
-                    if not asin:
+                    if not card["asin"]:
                         logger.debug(f"  Card {idx}: No ASIN, skipping")
                         continue
 
-                    # Log card outer HTML for debugging (first 200 chars)
-                    try:
-                        outer_html = await card.evaluate("el => el.outerHTML")
-                        logger.debug(f"  Card {idx} ASIN={asin}: {outer_html[:200]}...")
-                    except Exception:
-                        pass
-
-                    # Check if sponsored
-                    sponsored = await card.locator('[data-component-type="sp-sponsored-result"]').count() > 0
-
-                    # Get title - try multiple selectors
-                    title = None
-                    for selector in ["h2 a span", "h2 span", "h2.s-line-clamp-2 span", "h2"]:
-                        title_elem = card.locator(selector).first
-                        if await title_elem.count() > 0:
-                            try:
-                                title = await title_elem.inner_text()
-                                if title:
-                                    title = title.strip()
-                                    break
-                            except Exception:
-                                pass
-
+                    title = (card["title"] or "").strip()
                     if not title:
-                        # Try to get any text content from the card
-                        try:
-                            all_text = await card.inner_text()
-                            logger.debug(f"  Card {idx}: No h2 title. Card text preview: {all_text[:100]}...")
-                        except Exception:
-                            pass
+                        logger.debug(f"  Card {idx}: No h2 title")
                         continue
 
                     logger.debug(f"  Card {idx}: Found title = {title[:50]}...")
 
-                    # Get URL
+                    # Build absolute URL
                     url = None
-                    link_elem = card.locator("h2 a, a[href*='/dp/']").first
-                    if await link_elem.count() > 0:
-                        href = await link_elem.get_attribute("href")
-                        if href and href != "#":
-                            if href.startswith("/"):
-                                url = f"{AMAZON_FR_BASE_URL}{href}"
-                            elif href.startswith("http"):
-                                url = href
+                    href = card["href"]
+                    if href and href != "#":
+                        if href.startswith("/"):
+                            url = f"{AMAZON_FR_BASE_URL}{href}"
+                        elif href.startswith("http"):
+                            url = href
 
                     if not url:
                         logger.debug(f"  Card {idx}: No valid URL found")
@@ -400,86 +422,24 @@ class AmazonScraperService:
 
                     logger.debug(f"  Card {idx}: Found URL = {url[:60]}...")
 
-                    # Get price - try multiple selectors
                     price = None
-                    for selector in [
-                        ".a-price .a-offscreen",
-                        ".a-price-whole",
-                        "span.a-price span.a-offscreen",
-                        ".a-price",
-                    ]:
-                        price_elem = card.locator(selector).first
-                        if await price_elem.count() > 0:
-                            try:
-                                price_text = await price_elem.inner_text()
-                                price = parse_amazon_price(price_text)
-                                if price:
-                                    logger.debug(f"  Card {idx}: Found price = {price}€")
-                                    break
-                            except Exception:
-                                pass
-
-                    # Get original price
-                    original_price = None
-                    orig_price_elem = card.locator(".a-price.a-text-price .a-offscreen").first
-                    if await orig_price_elem.count() > 0:
-                        try:
-                            orig_text = await orig_price_elem.inner_text()
-                            original_price = parse_amazon_price(orig_text)
-                        except Exception:
-                            pass
-
-                    # Get rating
-                    rating = None
-                    for selector in ['[aria-label*="étoile"]', '[aria-label*="star"]', "i.a-icon-star span"]:
-                        rating_elem = card.locator(selector).first
-                        if await rating_elem.count() > 0:
-                            try:
-                                aria_label = await rating_elem.get_attribute("aria-label")
-                                if aria_label:
-                                    rating = parse_rating(aria_label)
-                                else:
-                                    # Try inner text
-                                    rating_text = await rating_elem.inner_text()
-                                    rating = parse_rating(rating_text)
-                                if rating:
-                                    break
-                            except Exception:
-                                pass
-
-                    # Get reviews count
-                    reviews_count = None
-                    reviews_elem = card.locator("span.s-underline-text, span[aria-label*='évaluation']").first
-                    if await reviews_elem.count() > 0:
-                        try:
-                            reviews_text = await reviews_elem.inner_text()
-                            reviews_count = parse_reviews_count(reviews_text)
-                        except Exception:
-                            pass
-
-                    # Get image URL
-                    image_url = None
-                    img_elem = card.locator("img.s-image, img").first
-                    if await img_elem.count() > 0:
-                        image_url = await img_elem.get_attribute("src")
-
-                    # Check Prime
-                    prime = await card.locator('[aria-label*="Prime"], i.a-icon-prime').count() > 0
-
-                    # Check stock
-                    in_stock = await card.locator('[aria-label*="Indisponible"]').count() == 0
+                    for price_text in card["priceTexts"]:
+                        price = parse_amazon_price(price_text)
+                        if price:
+                            logger.debug(f"  Card {idx}: Found price = {price}€")
+                            break
 
                     product = AmazonProduct(
                         title=title,
                         url=url,
                         price=price,
-                        original_price=original_price,
-                        rating=rating,
-                        reviews_count=reviews_count,
-                        image_url=image_url,
-                        in_stock=in_stock,
-                        prime=prime,
-                        sponsored=sponsored,
+                        original_price=parse_amazon_price(card["originalPriceText"]),
+                        rating=parse_rating(card["ratingText"]),
+                        reviews_count=parse_reviews_count(card["reviewsText"]),
+                        image_url=card["img"],
+                        in_stock=not card["unavailable"],
+                        prime=card["prime"],
+                        sponsored=card["sponsored"],
                     )
                     products.append(product)
                     logger.info(f"  ✓ DOM [{len(products)}] {title[:40]}... - {price}€")
@@ -665,6 +625,7 @@ class AmazonScraperService:
 
                 # Parse with BeautifulSoup
                 soup = BeautifulSoup(html_content, "html.parser")
+                del html_content
                 product_cards = soup.find_all("div", {"data-component-type": "s-search-result"})
 
                 if not product_cards:
@@ -676,15 +637,8 @@ class AmazonScraperService:
 
                 logger.info(f"📦 Found {len(product_cards)} product cards")
 
-                for idx, card in enumerate(product_cards):
-                    if len(products) >= max_results:
-                        break
-                    try:
-                        product = cls._extract_product(card, idx)
-                        if product:
-                            products.append(product)
-                    except Exception as e:
-                        logger.error(f"Error parsing card {idx}: {e}")
+                # islice stops the lazy card walk as soon as max_results products are built
+                products = list(islice(cls._iter_products(product_cards), max_results))
 
                 logger.info(f"✅ Extracted {len(products)} products")
 
@@ -697,6 +651,18 @@ class AmazonScraperService:
 
         return products
 
+    @classmethod
+    def _iter_products(cls, product_cards) -> Iterator[AmazonProduct]:
+        """Yield the products that could be extracted from the cards, skipping invalid ones"""
+        for idx, card in enumerate(product_cards):
+            try:
+                product = cls._extract_product(card, idx)
+            except Exception as e:
+                logger.error(f"Error parsing card {idx}: {e}")
+                continue
+            if product:
+                yield product
+
     @staticmethod
     def _extract_product(card, idx: int) -> AmazonProduct | None:
         """Extract product data from card"""
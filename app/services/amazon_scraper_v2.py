@@ -9,7 +9,8 @@ import re
 from typing import Any
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+import aiofiles
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import BaseModel, Field
 
 from app.services.browserless_service import browserless_service
@@ -20,6 +21,10 @@ logger = logging.getLogger(__name__)
 AMAZON_FR_BASE_URL = "https://www.amazon.fr"
 AMAZON_FR_SEARCH_URL = "https://www.amazon.fr/s?k={query}"
 
+# Only build the product card subtrees: both the primary (data-component-type)
+# and the alternative (data-asin + data-index) cards carry a data-asin attribute
+CARD_STRAINER = SoupStrainer("div", attrs={"data-asin": True})
+
 
 # ============================================================================
 # PYDANTIC SCHEMAS
@@ -43,6 +48,11 @@ class AmazonProduct(BaseModel):
 # PRICE PARSING HELPERS
 # ============================================================================
 
+_PRICE_TRANS = str.maketrans({' ': None, '\xa0': None, '€': None, ',': '.'})
+_PRICE_RE = re.compile(r'(\d+\.?\d*)')
+_RATING_RE = re.compile(r'(\d+[,.]\d+)')
+
+
 def parse_amazon_price(price_text: str) -> float | None:
     """
     Parse Amazon price formats:
@@ -54,17 +64,15 @@ def parse_amazon_price(price_text: str) -> float | None:
     if not price_text:
         return None
 
-    # Remove currency symbols and extra spaces
-    cleaned = price_text.strip().replace('€', '').replace('EUR', '').strip()
-
-    # Remove thousands separators (space or dot in French format)
-    cleaned = cleaned.replace(' ', '').replace('\xa0', '')  # \xa0 is non-breaking space
+    # Remove currency symbols and thousands separators, comma -> dot, in one pass
+    cleaned = price_text.translate(_PRICE_TRANS).replace('EUR', '')
 
-    # Replace comma with dot for decimal separator
-    cleaned = cleaned.replace(',', '.')
+    # Fast path: a plain "12.99" does not need the regex
+    if cleaned[:1].isdecimal() and cleaned.replace('.', '', 1).isdecimal():
+        return float(cleaned)
 
     # Extract first number (in case of ranges like "12.99 - 15.99")
-    match = re.search(r'(\d+\.?\d*)', cleaned)
+    match = _PRICE_RE.search(cleaned)
     if match:
         try:
             return float(match.group(1))
@@ -80,7 +88,7 @@ def parse_rating(rating_text: str) -> float | None:
         return None
 
     # Match patterns like "4,5" or "4.5"
-    match = re.search(r'(\d+[,.]\d+)', rating_text)
+    match = _RATING_RE.search(rating_text)
     if match:
         try:
             return float(match.group(1).replace(',', '.'))
@@ -134,7 +142,8 @@ async def scrape_amazon_search(query: str, max_results: int = 20) -> list[Amazon
             url="https://www.amazon.fr",
             use_proxy=False,
             wait_selector=None,
-            extract_text=False
+            extract_text=False,
+            take_screenshot=False,
         )
 
         if not home_html or len(home_html) < 10000:
@@ -152,7 +161,8 @@ async def scrape_amazon_search(query: str, max_results: int = 20) -> list[Amazon
             url=search_url,
             use_proxy=False,  # Try without proxy first
             wait_selector=None,  # Let it load naturally
-            extract_text=False  # We want HTML for parsing
+            extract_text=False,  # We want HTML for parsing
+            take_screenshot=False,
         )
 
         if not html_content or len(html_content) < 10000:
@@ -161,17 +171,18 @@ async def scrape_amazon_search(query: str, max_results: int = 20) -> list[Amazon
 
         logger.info(f"✅ Page loaded successfully ({len(html_content)} bytes)")
 
-        # Debug: Save HTML to file for inspection
-        debug_file = f"/tmp/amazon_debug_{query[:20]}.html"
-        try:
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            logger.debug(f"📝 HTML saved to {debug_file} for debugging")
-        except Exception as e:
-            logger.debug(f"Could not save debug HTML: {e}")
+        # Debug: Save HTML to file for inspection (only when debugging, without blocking the loop)
+        if logger.isEnabledFor(logging.DEBUG):
+            debug_file = f"/tmp/amazon_debug_{query[:20]}.html"
+            try:
+                async with aiofiles.open(debug_file, 'w', encoding='utf-8') as f:
+                    await f.write(html_content)
+                logger.debug(f"📝 HTML saved to {debug_file} for debugging")
+            except Exception as e:
+                logger.debug(f"Could not save debug HTML: {e}")
 
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parse HTML with BeautifulSoup, keeping only the candidate cards
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=CARD_STRAINER)
 
         # Amazon uses data-component-type="s-search-result" for product cards
         product_cards = soup.find_all('div', {'data-component-type': 's-search-result'})
@@ -185,10 +196,11 @@ async def scrape_amazon_search(query: str, max_results: int = 20) -> list[Amazon
 
         if not product_cards:
             logger.warning("⚠️ No products found - checking for CAPTCHA or blocks")
-            # Check for CAPTCHA
-            if 'captcha' in html_content.lower():
+            # Check for CAPTCHA (markers can be anywhere in the document)
+            page_text = html_content.lower()
+            if 'captcha' in page_text:
                 logger.error("🚫 CAPTCHA detected - Amazon blocked the request")
-            elif 'robot' in html_content.lower() or 'bot' in html_content.lower():
+            elif 'robot' in page_text or 'bot' in page_text:
                 logger.error("🤖 Bot detection triggered")
             else:
                 logger.warning("📦 Empty results - query may have no matches")
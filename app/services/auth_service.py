@@ -20,6 +20,9 @@ JWT_EXPIRATION_HOURS = 24
 DEFAULT_ADMIN_USERNAME = "admin"
 DEFAULT_ADMIN_PASSWORD = "admin"
 
+# Set once seeding has been checked so subsequent calls skip the query
+_seeded = False
+
 
 def hash_password(password: str) -> str:
     """Hash password using SHA-256 with salt."""
@@ -143,8 +146,14 @@ def toggle_user_active(db: Session, user_id: int) -> models.User | None:
 
 def seed_default_admin(db: Session) -> bool:
     """Create default admin user if no users exist."""
-    user_count = db.query(models.User).count()
-    if user_count == 0:
+    global _seeded
+    if _seeded:
+        return False
+
+    # Fetch a single id instead of counting the whole table
+    if db.query(models.User.id).first() is None:
         create_user(db, DEFAULT_ADMIN_USERNAME, DEFAULT_ADMIN_PASSWORD, is_admin=True)
+        _seeded = True
         return True
+    _seeded = True
     return False
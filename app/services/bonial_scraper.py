@@ -2,20 +2,31 @@
 Bonial.fr Scraper Service
 
 Scrapes promotional catalogs from Bonial.fr for configured enseignes.
-Uses Playwright for browser automation.
+Reads the server-rendered listing over HTTP when possible and uses Playwright
+for browser automation otherwise.
 """
 
 import asyncio
+import calendar
+import functools
 import hashlib
 import logging
 import re
 import os
-from datetime import datetime
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from itertools import islice
 from typing import Any
+from urllib.parse import urljoin, urlsplit
 
-from playwright.async_api import async_playwright, Page, Browser
+import httpx
+from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright, Route
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
+from app import database
 from app.models import Enseigne, Catalogue, CataloguePage, ScrapingLog
 
 logger = logging.getLogger(__name__)
@@ -26,17 +37,214 @@ BONIAL_SELECTORS = {
     "catalog_title": "h2",  # Will be searched within the parent container
     "catalog_image": "img",  # Will be searched within the parent container
     "cookie_accept": "button:has-text('Accepter')",
+    "cookie_banner": "#onetrust-banner-sdk",
+    "catalog_viewer_link": "a[href*='/contentViewer/']",  # Present once the catalog cards are rendered
+    "catalog_page_image": "img[src*='content-media.bonial.biz']",
+    "viewer_overlay_close": "button:has-text('Continuer'), button:has-text('Fermer')",
 }
 
+# Date tokens extracted from the card text, in the page or from server-rendered HTML
 DATE_PATTERN = r"(\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?)"
+_DATE_TOKEN_RE = re.compile(DATE_PATTERN)
+# Same matches as DATE_PATTERN, with day, month and optional year captured separately
+_DATE_PARTS_RE = re.compile(r"(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?")
+# Usual Bonial range, e.g. "25/11 - lun. 08/12/2025": the year is only given on the end date
+_RANGE_RE = re.compile(r"(\d{2})[/-](\d{2})\s*[-\u2013]\s*\D*?(\d{2})[/-](\d{2})[/-](\d{4}|\d{2})(?!\d)")
+# Headings of generic page sections that are not catalogs (matched case-insensitively)
+IGNORED_TITLES = (
+    "restez informé",
+    "catalogues bazar",
+    "une enseigne",
+    "optimisez",
+    "toutes les offres",
+    "voir les offres",
+    "téléchargez l'application",
+    "newsletter",
+)
+IGNORED_TITLES_PATTERN = "|".join(map(re.escape, IGNORED_TITLES))
+_IGNORED_TITLES_RE = re.compile(IGNORED_TITLES_PATTERN, re.IGNORECASE)
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# Validity assumed for catalogs whose dates cannot be parsed
+_ONE_WEEK = timedelta(days=7)
 
+# Requests aborted while scraping: the list page is read from the DOM only (covers come
+# from img[src]), while the viewer still needs the page images to read their natural size.
+# Assets are recognised by extension (images, fonts, media, stylesheets, text tracks, manifests).
+BLOCKED_EXTENSIONS = (
+    "png", "jpe?g", "gif", "webp", "avif", "svg", "ico",
+    "woff2?", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "m3u8",
+    "css", "vtt", "webmanifest",
+)
+CATALOG_IMAGE_HOST = "content-media.bonial.biz"
+BLOCKED_HOSTS = (
+    "googletagmanager",
+    "google-analytics",
+    "googlesyndication",
+    "doubleclick",
+    "criteo",
+    "amazon-adsystem",
+    "adnxs",
+    "hotjar",
+    "facebook.net",
+    "adjust.com",
+)
 
-def parse_bonial_dates(date_str: str) -> tuple[datetime, datetime]:
+
+def _blocked_url_re(allowed_host: str | None = None) -> re.Pattern:
+    """URLs of ad/analytics hosts, and of assets not served by allowed_host."""
+    hosts = "|".join(map(re.escape, BLOCKED_HOSTS))
+    exempt = rf"(?!https?://{re.escape(allowed_host)}/)" if allowed_host else ""
+    assets = rf"^{exempt}[^?#]*\.(?:{'|'.join(BLOCKED_EXTENSIONS)})(?:[?#]|$)"
+    return re.compile(rf"{hosts}|{assets}", re.IGNORECASE)
+
+
+LIST_BLOCKED_URL_RE = _blocked_url_re()
+VIEWER_BLOCKED_URL_RE = _blocked_url_re(allowed_host=CATALOG_IMAGE_HOST)
+
+# Number of enseignes scraped concurrently (each one gets its own page and DB session)
+ENSEIGNE_CONCURRENCY = int(os.environ.get("BONIAL_ENSEIGNE_CONCURRENCY", "3"))
+
+# Catalog viewers opened in parallel within one enseigne
+CATALOG_CONCURRENCY = int(os.environ.get("BONIAL_CONCURRENCY", "4"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Read the catalog listing over plain HTTP before falling back to the browser
+HTTP_LISTING = os.environ.get("BONIAL_HTTP_LISTING", "true").lower() == "true"
+
+# Cookies and local storage kept between runs so consent is not asked again
+STORAGE_STATE_PATH = os.environ.get("BONIAL_STORAGE_STATE", "/tmp/bonial_state.json")
+
+
+# Minimum delay between two requests to the same Bonial host, shared by all tasks
+MIN_REQUEST_INTERVAL = float(os.environ.get("BONIAL_MIN_REQUEST_INTERVAL", "0.5"))
+
+
+class RateLimiter:
+    """Space out requests to the same host by at least min_interval seconds."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: dict[str, float] = {}
+        # Created on first use, per event loop (an asyncio.Lock cannot be shared between loops)
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def wait(self, host: str | None) -> None:
+        """Reserve the next free slot for host and sleep only until it comes."""
+        async with self._get_lock():
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+rate_limiter = RateLimiter(MIN_REQUEST_INTERVAL)
+
+
+# In-page extraction of the catalog cards (argument: [selectors, ignored titles pattern,
+# date pattern]). Walks up from each title to its card and returns plain JSON in one round-trip.
+EXTRACT_CATALOGS_SCRIPT = """
+([sel, ignoredTitles, datePattern]) => {
+    const results = [];
+
+    // Generic section titles, matched in a single pass per heading
+    const genericTitles = new RegExp(ignoredTitles, 'i');
+    const dateRe = new RegExp(datePattern, 'g');
+
+    // Find all h2 elements which typically contain catalog titles
+    const h2Elements = document.querySelectorAll(sel.catalog_title);
+
+    h2Elements.forEach((h2, index) => {
+        const title = h2.textContent.trim();
+
+        // Skip generic titles
+        if (genericTitles.test(title)) {
+            return;
+        }
+
+        // Find parent container
+        let container = h2.parentElement;
+        for (let i = 0; i < 10 && container; i++) {
+            // Look for the viewer link first, then the cover image
+            const link = container.querySelector(sel.catalog_viewer_link);
+            const img = link && container.querySelector(sel.catalog_image);
+
+            if (img) {
+                // Found a complete catalog card!
+                const imgSrc = img.src || img.getAttribute('data-src') || img.getAttribute('srcset')?.split(' ')[0];
+                const href = link.href;
+
+                // Try to extract dates from container text
+                const dateMatch = container.textContent.match(dateRe);
+
+                results.push({
+                    title: title,
+                    image: imgSrc,
+                    url: href,
+                    dates: dateMatch || []
+                });
+                break;  // Found it, stop going up
+            }
+
+            container = container.parentElement;
+        }
+    });
+
+    return results;
+}
+"""
+
+
+# Smaller viewer images are thumbnails, not catalog pages
+MIN_PAGE_IMAGE_SIZE = 200
+
+# In-page extraction of the catalog pages (argument: [image selector, minimum size]).
+# Duplicates and thumbnails are dropped in the browser; returns [{src, width, height}].
+EXTRACT_PAGES_SCRIPT = """
+([selector, minSize]) => {
+    const seen = new Set();
+    const pages = [];
+    for (const img of document.querySelectorAll(selector)) {
+        const src = img.currentSrc || img.src;  // Absolute URL of the image actually loaded
+        if (!src) continue;
+        // Cache-busting query strings do not make a different page
+        const url = new URL(src);
+        const key = url.origin + url.pathname;
+        if (seen.has(key)) continue;
+        if (img.naturalWidth < minSize || img.naturalHeight < minSize) continue;
+        seen.add(key);
+        pages.push({src: src, width: img.naturalWidth, height: img.naturalHeight});
+    }
+    return pages;
+}
+"""
+
+
+def _is_valid_date(year: int, month: int, day: int) -> bool:
+    """Check a date up front instead of catching datetime's ValueError."""
+    if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1]):
+        return False
+    return not (month == 2 and day == 29 and not calendar.isleap(year))
+
+
+def parse_bonial_dates(date_str: str, today: datetime | None = None) -> tuple[datetime, datetime]:
     """
     Parse Bonial date format to datetime objects.
     
     Args:
         date_str: Date string like "mar. 25/11 - lun. 08/12/2025"
+        today: Reference date for yearless dates (defaults to now); pass it when
+            parsing many cards so the clock is read once
     
     Returns:
         Tuple of (date_debut, date_fin)
@@ -44,140 +252,231 @@ def parse_bonial_dates(date_str: str) -> tuple[datetime, datetime]:
     Raises:
         ValueError: If date format is invalid
     """
-    matches = re.findall(DATE_PATTERN, date_str)
+    # Every date has a separator: skip the regexes for text that cannot contain one
+    if "/" not in date_str and "-" not in date_str:
+        raise ValueError(f"Invalid date format: {date_str}")
+    
+    # Fast path for a lone "dd/mm/yyyy" end date: plain slicing, no regex
+    if len(date_str) == 10 and date_str[2] in "/-" and date_str[5] == date_str[2]:
+        digits = date_str[:2] + date_str[3:5] + date_str[6:]
+        if digits.isascii() and digits.isdigit():
+            day, month, year = int(date_str[:2]), int(date_str[3:5]), int(date_str[6:])
+            if not _is_valid_date(year, month, day):
+                raise ValueError("No valid dates parsed")
+            date = datetime(year, month, day)
+            today = today or datetime.now()
+            return (today, date) if date > today else (date, date)
+    
+    # Fast path for the usual range format, read straight from the captured digits
+    range_match = _RANGE_RE.search(date_str)
+    if range_match:
+        day1, month1, day2, month2, year2 = map(int, range_match.groups())
+        if year2 < 100:
+            year2 += 2000
+        year1 = year2 - 1 if month1 > month2 else year2
+        if _is_valid_date(year1, month1, day1) and _is_valid_date(year2, month2, day2):
+            return datetime(year1, month1, day1), datetime(year2, month2, day2)
+    
+    matches = _DATE_PARTS_RE.findall(date_str)
     
     if not matches:
         logger.warning(f"No dates found in '{date_str}', using default duration")
         raise ValueError(f"Invalid date format: {date_str}")
     
-    today = datetime.now()
+    # A validity range is bounded by its first and last dates
+    if len(matches) > 2:
+        matches = [matches[0], matches[-1]]
+    
+    today = today or datetime.now()
     current_year = today.year
+    # Yearless dates more than 3 months before the current month belong to next year
+    rollover_month = today.month - 3
     
-    parsed_dates = []
-    for date_match in matches:
-        date_match = date_match.replace("-", "/")
-        parts = date_match.split("/")
-        
-        day = int(parts[0])
-        month = int(parts[1])
-        year = int(parts[2]) if len(parts) > 2 else current_year
+    # Bounds are tracked as dates are parsed: no intermediate list, no min()/max() passes
+    earliest = latest = None
+    is_range = False
+    for day_str, month_str, year_str in matches:
+        day = int(day_str)
+        month = int(month_str)
+        year = int(year_str) if year_str else current_year
         
         if year < 100:
             year += 2000
             
-        if len(parts) == 2:
-            if month < today.month - 3:
-                year += 1
-                
-        try:
-            parsed_dates.append(datetime(year, month, day))
-        except ValueError:
+        if not year_str and month < rollover_month:
+            year += 1
+        
+        if not _is_valid_date(year, month, day):
             continue
+        date = datetime(year, month, day)
+        if earliest is None:
+            earliest = latest = date
+            continue
+        is_range = True
+        if date < earliest:
+            earliest = date
+        elif date > latest:
+            latest = date
             
-    if not parsed_dates:
+    if earliest is None:
         raise ValueError("No valid dates parsed")
         
-    if len(parsed_dates) >= 2:
-        return min(parsed_dates), max(parsed_dates)
-    elif len(parsed_dates) == 1:
-        date = parsed_dates[0]
-        if date > today:
-            return today, date
-        else:
-            return date, date
+    if is_range:
+        return earliest, latest
     
-    return parsed_dates[0], parsed_dates[0]
+    if earliest > today:
+        return today, earliest
+    return earliest, earliest
 
 
+@functools.lru_cache(maxsize=4096)
 def compute_catalog_hash(enseigne_id: int, titre: str, date_debut: datetime) -> str:
-    """Compute SHA256 hash for duplicate detection."""
+    """Compute a 256-bit BLAKE2b hash (64 hex chars) for duplicate detection.
+
+    Memoized: the same catalogs are listed again on every scheduled run.
+    """
+    content = f"{enseigne_id}|{titre}|{date_debut.isoformat()}"
+    return hashlib.blake2b(content.encode(), digest_size=32, usedforsecurity=False).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _legacy_catalog_hash(enseigne_id: int, titre: str, date_debut: datetime) -> str:
+    """SHA256 hash used before the switch to BLAKE2b, still matched for existing rows."""
     content = f"{enseigne_id}|{titre}|{date_debut.isoformat()}"
-    return hashlib.sha256(content.encode()).hexdigest()
+    return hashlib.sha256(content.encode(), usedforsecurity=False).hexdigest()
+
+
+async def _abort(route: Route) -> None:
+    try:
+        await route.abort()
+    except Exception:
+        await route.continue_()
+
+
+async def block_resources(page: Page, blocked_url_re: re.Pattern) -> None:
+    """
+    Abort the requests whose URL matches blocked_url_re.
+
+    The pattern is matched by the Playwright driver, so only the aborted requests reach
+    Python; a "**/*" handler used to pause every request for a round trip.
+    """
+    # The same page is reused for the list and the viewer: replace any previous filter
+    await page.unroute_all(behavior="ignoreErrors")
+    await page.route(blocked_url_re, _abort)
 
 
 async def accept_cookies(page: Page) -> None:
     """Accept cookie consent banner if present."""
+    # Consent is normally restored from the context, so do not wait for a banner that never comes
+    # (OneTrust keeps its hidden banner in the DOM once consent is given, so check visibility)
+    if not await page.locator(BONIAL_SELECTORS["cookie_accept"]).first.is_visible():
+        logger.debug("No cookie banner found or already accepted")
+        return
     try:
         await page.click(BONIAL_SELECTORS["cookie_accept"], timeout=3000)
+        await page.locator(BONIAL_SELECTORS["cookie_banner"]).first.wait_for(state="hidden", timeout=3000)
+        # Persist consent right away so later runs never see the banner, even if this one fails
+        await page.context.storage_state(path=STORAGE_STATE_PATH)
         logger.debug("Accepted cookies")
-        await asyncio.sleep(1)
     except Exception:
         logger.debug("No cookie banner found or already accepted")
 
 
-async def scrape_catalog_list(page: Page, enseigne: Enseigne) -> list[dict[str, Any]]:
-    """Scrape the list of catalogs for an enseigne from Bonial using full-page scroll."""
-    url = f"https://www.bonial.fr/Enseignes/{enseigne.slug_bonial}"
-    logger.info(f"Scraping catalog list for {enseigne.nom} from {url}")
+def _parse_catalog_cards(html_content: str, base_url: str) -> list[dict[str, Any]]:
+    """Python twin of EXTRACT_CATALOGS_SCRIPT for server-rendered HTML."""
+    soup = BeautifulSoup(html_content, "lxml")
+    results = []
+    for h2 in soup.find_all(BONIAL_SELECTORS["catalog_title"]):
+        title = h2.get_text().strip()
+        if _IGNORED_TITLES_RE.search(title):
+            continue
+        for container in islice(h2.parents, 10):
+            link = container.select_one(BONIAL_SELECTORS["catalog_viewer_link"])
+            img = link and container.find(BONIAL_SELECTORS["catalog_image"])
+            if img:
+                image = img.get("src") or img.get("data-src") or (img.get("srcset") or "").split(" ")[0]
+                results.append({
+                    "title": title,
+                    "image": urljoin(base_url, image) if image else None,
+                    "url": urljoin(base_url, link["href"]),
+                    "dates": _DATE_TOKEN_RE.findall(container.get_text()),
+                })
+                break
+    return results
+
+
+async def _fetch_catalog_cards_http(url: str) -> list[dict[str, Any]]:
+    """Read the catalog cards from the server-rendered listing, without a browser."""
+    try:
+        await rate_limiter.wait(urlsplit(url).hostname)
+        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+            response = await client.get(url, headers={"User-Agent": USER_AGENT, "Accept-Language": "fr-FR,fr;q=0.9"})
+        if response.status_code != 200:
+            logger.debug(f"HTTP listing fetch returned {response.status_code} for {url}")
+            return []
+        return _parse_catalog_cards(response.text, str(response.url))
+    except Exception as e:
+        logger.debug(f"HTTP listing fetch failed for {url}: {e}")
+        return []
+
+
+async def _extract_catalog_cards_browser(page: Page, enseigne: Enseigne, url: str) -> list[dict[str, Any]]:
+    """Load the listing in the browser, scroll through lazy-loaded cards and extract them."""
+    await block_resources(page, LIST_BLOCKED_URL_RE)
+    await rate_limiter.wait(urlsplit(url).hostname)
+    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
     
-    await page.goto(url, wait_until="networkidle")
+    # Wait for the catalog cards themselves rather than for network idle
+    try:
+        await page.locator(BONIAL_SELECTORS["catalog_viewer_link"]).first.wait_for(state="attached", timeout=10000)
+    except Exception:
+        logger.debug(f"No catalog card rendered yet for {enseigne.nom}")
     await accept_cookies(page)
     
-    # Scroll the page multiple times to trigger lazy loading
+    # Scroll to trigger lazy loading until no new catalog card shows up
     logger.info("Scrolling page to load all dynamic content...")
-    for i in range(5):  # Scroll 5 times
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await asyncio.sleep(2)  # Wait for content to load
-    
-    # Scroll back to top
-    await page.evaluate("window.scrollTo(0, 0)")
-    await asyncio.sleep(1)
+    card_selector = BONIAL_SELECTORS["catalog_viewer_link"]
+    for _ in range(5):  # Scroll at most 5 times
+        card_count = await page.evaluate(
+            """(selector) => {
+                window.scrollTo(0, document.body.scrollHeight);
+                return document.querySelectorAll(selector).length;
+            }""",
+            card_selector,
+        )
+        try:
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[card_selector, card_count],
+                timeout=2000,
+            )
+        except Exception:
+            break  # Nothing new was loaded
     
     # Extract all catalog data using JavaScript to find patterns
-    catalogs_data = await page.evaluate("""
-        () => {
-            const results = [];
-            
-            // Find all h2 elements which typically contain catalog titles
-            const h2Elements = document.querySelectorAll('h2');
-            
-            h2Elements.forEach((h2, index) => {
-                const title = h2.textContent.trim();
-                
-                // Skip generic titles
-                const genericTitles = ['restez informé', 'catalogues bazar', 'une enseigne', 'optimisez'];
-                if (genericTitles.some(generic => title.toLowerCase().includes(generic))) {
-                    return;
-                }
-                
-                // Find parent container
-                let container = h2.parentElement;
-                for (let i = 0; i < 10 && container; i++) {
-                    // Look for image in this container
-                    const img = container.querySelector('img');
-                    // Look for link in this container
-                    const link = container.querySelector('a[href*="/contentViewer/"]');
-                    
-                    if (img && link) {
-                        // Found a complete catalog card!
-                        const imgSrc = img.src || img.getAttribute('data-src') || img.getAttribute('srcset')?.split(' ')[0];
-                        const href = link.href;
-                        
-                        // Try to extract dates from container text
-                        const containerText = container.textContent;
-                        const dateMatch = containerText.match(/(\d{1,2}[\/\-]\d{1,2}(?:[\/\-]\d{2,4})?)/g);
-                        
-                        results.push({
-                            title: title,
-                            image: imgSrc,
-                            url: href,
-                            dates: dateMatch || [],
-                            containerText: containerText.substring(0, 500)  // First 500 chars for debugging
-                        });
-                        break;  // Found it, stop going up
-                    }
-                    
-                    container = container.parentElement;
-                }
-            });
-            
-            return results;
-        }
-    """)
+    return await page.evaluate(
+        EXTRACT_CATALOGS_SCRIPT, [BONIAL_SELECTORS, IGNORED_TITLES_PATTERN, DATE_PATTERN]
+    )
+
+
+async def scrape_catalog_list(page: Page, enseigne: Enseigne) -> list[dict[str, Any]]:
+    """
+    Scrape the list of catalogs for an enseigne from Bonial.
+
+    The server-rendered listing is read over plain HTTP first; the browser (with
+    full-page scroll) is only used when that yields no card.
+    """
+    url = f"https://www.bonial.fr/Enseignes/{enseigne.slug_bonial}"
+    logger.info(f"Scraping catalog list for {enseigne.nom} from {url}")
+    
+    catalogs_data = await _fetch_catalog_cards_http(url) if HTTP_LISTING else []
+    if not catalogs_data:
+        catalogs_data = await _extract_catalog_cards_browser(page, enseigne, url)
     
     logger.info(f"Found {len(catalogs_data)} potential catalog cards for {enseigne.nom}")
     
     catalogues = []
+    now = datetime.now()
     
     for idx, cat_data in enumerate(catalogs_data):
         try:
@@ -185,7 +484,6 @@ async def scrape_catalog_list(page: Page, enseigne: Enseigne) -> list[dict[str,
             image_url = cat_data.get('image')
             catalogue_url = cat_data.get('url')
             dates_list = cat_data.get('dates', [])
-            container_text = cat_data.get('containerText', '')
             
             if not catalogue_url or not image_url:
                 logger.warning(f"Skipping catalog {idx}: missing URL or image")
@@ -195,16 +493,13 @@ async def scrape_catalog_list(page: Page, enseigne: Enseigne) -> list[dict[str,
             if image_url and image_url.startswith('//'):
                 image_url = 'https:' + image_url
             
-            # Parse dates
-            date_debut, date_fin = datetime.now(), datetime.now()
-            try:
-                if dates_list:
-                    dates_str = ' - '.join(dates_list)
-                    date_debut, date_fin = parse_bonial_dates(dates_str)
-            except ValueError:
-                # Default to 1 week validity
-                from datetime import timedelta
-                date_fin = datetime.now() + timedelta(days=7)
+            # Parse dates, defaulting to 1 week validity
+            date_debut, date_fin = now, now + _ONE_WEEK
+            if dates_list:
+                try:
+                    date_debut, date_fin = parse_bonial_dates(' - '.join(dates_list), now)
+                except ValueError:
+                    pass
             
             catalogues.append({
                 "titre": titre.strip(),
@@ -227,53 +522,204 @@ async def scrape_catalog_pages(page: Page, catalogue_url: str) -> list[dict[str,
     """Scrape all pages of a catalog from the Bonial viewer."""
     logger.info(f"Scraping catalog pages from {catalogue_url}")
     
-    await page.goto(catalogue_url, wait_until="networkidle")
-    await asyncio.sleep(2)
+    await block_resources(page, VIEWER_BLOCKED_URL_RE)
+    await rate_limiter.wait(urlsplit(catalogue_url).hostname)
+    await page.goto(catalogue_url, wait_until="domcontentloaded", timeout=15000)
+    
+    # Natural sizes are only known once the images have loaded: this single wait is
+    # the readiness signal for the viewer
+    try:
+        await page.wait_for_function(
+            """([selector, minSize]) => Array.from(document.querySelectorAll(selector))
+                .some((img) => img.complete && img.naturalWidth >= minSize)""",
+            arg=[BONIAL_SELECTORS["catalog_page_image"], MIN_PAGE_IMAGE_SIZE],
+            timeout=8000,
+        )
+    except Exception:
+        logger.debug(f"Catalog page images not loaded yet: {catalogue_url}")
     
+    # Dismiss the viewer overlay only when it is shown, without waiting for it
+    overlay_button = page.locator(BONIAL_SELECTORS["viewer_overlay_close"]).first
     try:
-        await page.click("button:has-text('Continuer'), button:has-text('Fermer')", timeout=2000)
-        await asyncio.sleep(1)
+        if await overlay_button.is_visible():
+            await overlay_button.click(timeout=2000)
     except Exception:
         pass
     
-    images = await page.query_selector_all("img[src*='content-media.bonial.biz']")
+    # Filter thumbnails and duplicates in the page, returning only the catalog pages
+    images = await page.evaluate(
+        EXTRACT_PAGES_SCRIPT, [BONIAL_SELECTORS["catalog_page_image"], MIN_PAGE_IMAGE_SIZE]
+    )
     
     if not images:
         logger.warning(f"No images found in catalog viewer: {catalogue_url}")
         return []
     
-    seen_urls = set()
-    pages = []
-    
-    for idx, img in enumerate(images):
-        try:
-            src = await img.get_attribute("src")
-            
-            if src and src not in seen_urls:
-                width = await img.evaluate("el => el.naturalWidth")
-                height = await img.evaluate("el => el.naturalHeight")
-                
-                if width < 200 or height < 200:
-                    continue
-                
-                seen_urls.add(src)
-                pages.append({
-                    "numero_page": len(pages) + 1,
-                    "image_url": src,
-                    "largeur": width,
-                    "hauteur": height,
-                })
-        
-        except Exception as e:
-            logger.debug(f"Error processing image {idx}: {e}")
-            continue
+    pages = [
+        {
+            "numero_page": index,
+            "image_url": img["src"],
+            "largeur": img["width"],
+            "hauteur": img["height"],
+        }
+        for index, img in enumerate(images, start=1)
+    ]
     
     logger.info(f"Found {len(pages)} pages in catalog")
     return pages
 
 
-async def scrape_enseigne(enseigne: Enseigne, db: Session, browser: Browser | None = None) -> ScrapingLog:
+async def _connect_browser(p: Playwright) -> Browser:
+    """
+    Connect to the Browserless instance.
+
+    Uses Playwright's native protocol (Browserless v2 /chromium/playwright endpoint),
+    which is lighter per command than CDP, and falls back to CDP if it is unavailable.
+    """
+    browserless_url = os.environ.get("BROWSERLESS_URL", "ws://browserless:3000")
+    logger.info(f"Connecting to Browserless at {browserless_url}")
+    try:
+        return await p.chromium.connect(f"{browserless_url.rstrip('/')}/chromium/playwright", timeout=60000)
+    except Exception as e:
+        logger.warning(f"Playwright endpoint unavailable ({e}), falling back to CDP")
+        return await p.chromium.connect_over_cdp(browserless_url)
+
+
+class BonialBrowser:
+    """Playwright driver and Browserless connection shared by every run, kept open until shutdown()."""
+
+    _playwright: Playwright | None = None
+    _browser: Browser | None = None
+    _lock: asyncio.Lock | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        """
+        Lock of the running event loop, created on first use.
+
+        Playwright objects are bound to the loop that created them: state left by another
+        loop (a previous app lifespan, tests) is dropped rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            cls._loop = loop
+            cls._lock = asyncio.Lock()
+            cls._playwright = None
+            cls._browser = None
+        return cls._lock
+
+    @classmethod
+    async def get(cls) -> Browser:
+        """Return the shared browser, starting Playwright or reconnecting only when needed."""
+        async with cls._get_lock():
+            if cls._browser is not None and cls._browser.is_connected():
+                return cls._browser
+            if cls._playwright is None:
+                cls._playwright = await async_playwright().start()
+            cls._browser = await _connect_browser(cls._playwright)
+            return cls._browser
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared browser and stop Playwright."""
+        async with cls._get_lock():
+            if cls._browser is not None:
+                try:
+                    await cls._browser.close()
+                except Exception as e:
+                    logger.warning(f"Error closing Bonial browser: {e}")
+                cls._browser = None
+            if cls._playwright is not None:
+                await cls._playwright.stop()
+                cls._playwright = None
+
+
+async def shutdown() -> None:
+    """Close the browser shared by the Bonial runs (application shutdown)."""
+    await BonialBrowser.shutdown()
+
+
+async def _new_context(browser: Browser) -> BrowserContext:
+    """
+    Create a browser context shared by every enseigne of a run.
+
+    The storage state saved by the previous run is restored and consent cookies
+    are pre-seeded so Bonial never shows its banner; the HTTP cache is reused
+    across enseignes.
+    """
+    context = await browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={"width": 1280, "height": 800},
+        # Service workers would serve requests behind page.route's back and slow navigation
+        service_workers="block",
+        storage_state=STORAGE_STATE_PATH if os.path.exists(STORAGE_STATE_PATH) else None,
+    )
+    # OneTrust format: UTC with milliseconds and a "Z" suffix
+    consented_at = datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    await context.add_cookies([
+        {"name": "OptanonAlertBoxClosed", "value": consented_at, "domain": ".bonial.fr", "path": "/"},
+        {"name": "OptanonConsent", "value": "isGpcEnabled=0&groups=C0001:1", "domain": ".bonial.fr", "path": "/"},
+    ])
+    return context
+
+
+async def _close_context(context: BrowserContext) -> None:
+    """Save the context storage state for the next run, then close it."""
+    try:
+        await context.storage_state(path=STORAGE_STATE_PATH)
+    except Exception as e:
+        logger.warning(f"Could not save Bonial storage state: {e}")
+    await context.close()
+
+
+def _find_existing(
+    db: Session, enseigne_id: int, hashes: list[str], urls: list[str]
+) -> tuple[set[str], set[str]]:
+    """Return the hashes and viewer URLs already stored, with a single query."""
+    existing_hashes, existing_urls = set(), set()
+    # Read-only lookup: nothing pending in the session needs flushing first
+    with db.no_autoflush:
+        rows = db.query(Catalogue.content_hash, Catalogue.catalogue_url).filter(
+            or_(
+                Catalogue.content_hash.in_(hashes),
+                and_(Catalogue.enseigne_id == enseigne_id, Catalogue.catalogue_url.in_(urls)),
+            )
+        )
+        for content_hash, catalogue_url in rows:
+            existing_hashes.add(content_hash)
+            existing_urls.add(catalogue_url)
+    return existing_hashes, existing_urls
+
+
+def _save_results(db: Session, log: ScrapingLog) -> None:
+    """Commit the pending catalogs together with their scraping log."""
+    db.add(log)
+    try:
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error saving catalogs for enseigne {log.enseigne_id}: {e}")
+        db.rollback()
+        log.statut = "error"
+        log.catalogues_nouveaux = 0
+        log.message_erreur = str(e)
+        db.add(log)
+        db.commit()
+
+
+async def scrape_enseigne(
+    enseigne: Enseigne, db: Session, context: BrowserContext | None = None
+) -> ScrapingLog:
     """Scrape all catalogs for a specific enseigne."""
+    if context is None:
+        context = await _new_context(await BonialBrowser.get())
+        try:
+            return await scrape_enseigne(enseigne, db, context)
+        finally:
+            await _close_context(context)
+
+    # Blocking DB calls run in the default executor so other enseignes keep scraping
+    loop = asyncio.get_running_loop()
     start_time = datetime.now()
     log = ScrapingLog(
         enseigne_id=enseigne.id,
@@ -283,19 +729,9 @@ async def scrape_enseigne(enseigne: Enseigne, db: Session, browser: Browser | No
         catalogues_mis_a_jour=0,
     )
     
-    own_browser = browser is None
-    
+    page = None
     try:
-        if own_browser:
-            browserless_url = os.environ.get("BROWSERLESS_URL", "ws://browserless:3000")
-            async with async_playwright() as p:
-                browser = await p.chromium.connect_over_cdp(browserless_url)
-        
-        page = await browser.new_page()
-        
-        await page.set_extra_http_headers({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        page = await context.new_page()
         
         catalogues_data = await scrape_catalog_list(page, enseigne)
         log.catalogues_trouves = len(catalogues_data)
@@ -303,60 +739,90 @@ async def scrape_enseigne(enseigne: Enseigne, db: Session, browser: Browser | No
         if not catalogues_data:
             log.statut = "success"
             log.message_erreur = "No catalogs found (may be normal)"
-            await page.close()
             return log
         
+        # Check every candidate against the DB with a single query
+        # (legacy SHA256 hashes are included so catalogs stored before BLAKE2b still match).
+        # The viewer URL identifies a catalog even when its dates fell back to "now", which
+        # would otherwise give it a new hash on every run.
+        candidate_hashes = []
         for cat_data in catalogues_data:
+            key = (enseigne.id, cat_data["titre"], cat_data["date_debut"])
+            cat_data["content_hash"] = compute_catalog_hash(*key)
+            cat_data["legacy_hash"] = _legacy_catalog_hash(*key)
+            candidate_hashes += [cat_data["content_hash"], cat_data["legacy_hash"]]
+        existing_hashes, existing_urls = await loop.run_in_executor(
+            None,
+            _find_existing,
+            db,
+            enseigne.id,
+            candidate_hashes,
+            [c["catalogue_url"] for c in catalogues_data],
+        )
+        
+        new_catalogues = []
+        for cat_data in catalogues_data:
+            if (
+                cat_data["catalogue_url"] in existing_urls
+                or cat_data["content_hash"] in existing_hashes
+                or cat_data["legacy_hash"] in existing_hashes
+            ):
+                logger.debug(f"Catalog already exists: {cat_data['titre']}")
+            else:
+                # A card listed twice on the page must not be inserted twice
+                existing_hashes.add(cat_data["content_hash"])
+                existing_urls.add(cat_data["catalogue_url"])
+                new_catalogues.append(cat_data)
+        
+        # Viewers are fetched in parallel over a small pool of pages (the idle list page
+        # included) that are reused between catalogs; the session stays in this task
+        pool: asyncio.Queue[Page] = asyncio.Queue()
+        pool.put_nowait(page)
+        extra_pages = await asyncio.gather(
+            *(context.new_page() for _ in range(min(CATALOG_CONCURRENCY, len(new_catalogues)) - 1))
+        )
+        for viewer_page in extra_pages:
+            pool.put_nowait(viewer_page)
+        
+        async def process(cat_data: dict[str, Any]) -> Catalogue:
+            # Each catalog is built as soon as its viewer is read, while the others load
+            viewer_page = await pool.get()
             try:
-                content_hash = compute_catalog_hash(
-                    enseigne.id,
-                    cat_data["titre"],
-                    cat_data["date_debut"]
-                )
-                
-                existing = db.query(Catalogue).filter_by(content_hash=content_hash).first()
-                
-                if existing:
-                    logger.debug(f"Catalog already exists: {cat_data['titre']}")
-                    continue
-                
-                await asyncio.sleep(3)
-                pages_data = await scrape_catalog_pages(page, cat_data["catalogue_url"])
-                
-                catalogue = Catalogue(
-                    enseigne_id=enseigne.id,
-                    titre=cat_data["titre"],
-                    date_debut=cat_data["date_debut"],
-                    date_fin=cat_data["date_fin"],
-                    image_couverture_url=cat_data["image_couverture_url"],
-                    catalogue_url=cat_data["catalogue_url"],
-                    statut="actif",
-                    nombre_pages=len(pages_data),
-                    content_hash=content_hash,
-                )
-                db.add(catalogue)
-                db.flush()
-                
-                for page_data in pages_data:
-                    catalogue_page = CataloguePage(
-                        catalogue_id=catalogue.id,
-                        numero_page=page_data["numero_page"],
-                        image_url=page_data["image_url"],
-                        largeur=page_data["largeur"],
-                        hauteur=page_data["hauteur"],
-                    )
-                    db.add(catalogue_page)
-                
-                log.catalogues_nouveaux += 1
-                logger.info(f"Added new catalog: {cat_data['titre']}")
-                
-            except Exception as e:
-                logger.error(f"Error processing catalog: {e}")
-                continue
+                pages_data = await scrape_catalog_pages(viewer_page, cat_data["catalogue_url"])
+            finally:
+                pool.put_nowait(viewer_page)
+            logger.info(f"Added new catalog: {cat_data['titre']}")
+            return Catalogue(
+                enseigne_id=enseigne.id,
+                titre=cat_data["titre"],
+                date_debut=cat_data["date_debut"],
+                date_fin=cat_data["date_fin"],
+                image_couverture_url=cat_data["image_couverture_url"],
+                catalogue_url=cat_data["catalogue_url"],
+                statut="actif",
+                nombre_pages=len(pages_data),
+                content_hash=cat_data["content_hash"],
+                pages=[CataloguePage(**page_data) for page_data in pages_data],
+            )
         
-        db.commit()
+        try:
+            results = await asyncio.gather(*(process(c) for c in new_catalogues), return_exceptions=True)
+        finally:
+            for viewer_page in extra_pages:
+                await viewer_page.close()
+        
+        # The whole object graph stays in memory: the commit below flushes it with one
+        # batched INSERT for the catalogues and one for their pages
+        catalogues = []
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Error processing catalog: {result}")
+            else:
+                catalogues.append(result)
+        
+        db.add_all(catalogues)
+        log.catalogues_nouveaux = len(catalogues)
         log.statut = "success"
-        await page.close()
         
     except Exception as e:
         logger.error(f"Error scraping {enseigne.nom}: {e}")
@@ -365,38 +831,57 @@ async def scrape_enseigne(enseigne: Enseigne, db: Session, browser: Browser | No
         db.rollback()
     
     finally:
-        if own_browser and browser:
-            await browser.close()
-    
-    log.duree_secondes = (datetime.now() - start_time).total_seconds()
-    db.add(log)
-    db.commit()
+        log.duree_secondes = (datetime.now() - start_time).total_seconds()
+        await loop.run_in_executor(None, _save_results, db, log)
+        if page is not None:
+            await page.close()
     
     return log
 
 
-async def scrape_all_enseignes(db: Session) -> list[ScrapingLog]:
-    """Scrape all active enseignes. Uses Browserless service via WebSocket."""
+async def scrape_all_enseignes(
+    db: Session, session_factory: Callable[..., Session] | None = None
+) -> list[ScrapingLog]:
+    """
+    Scrape all active enseignes concurrently. Uses Browserless service via WebSocket.
+
+    The Browserless connection is kept open between runs (see shutdown()).
+
+    At most ENSEIGNE_CONCURRENCY enseignes run at once. Sessions are not safe to share
+    between tasks, so each enseigne is scraped with its own session and page; all pages
+    share one browser context so consent cookies and HTTP cache carry over.
+    """
     enseignes = db.query(Enseigne).filter_by(is_active=True).all()
     logger.info(f"Starting scraping for {len(enseignes)} active enseignes")
+    if not enseignes:
+        return []
     
-    logs = []
+    semaphore = asyncio.Semaphore(ENSEIGNE_CONCURRENCY)
+    session_factory = session_factory or database.SessionLocal
     
-    browserless_url = os.environ.get("BROWSERLESS_URL", "ws://browserless:3000")
-    logger.info(f"Connecting to Browserless at {browserless_url}")
+    # The browser outlives the run; only the context is per run
+    context = await _new_context(await BonialBrowser.get())
     
-    async with async_playwright() as p:
-        browser = await p.chromium.connect_over_cdp(browserless_url)
-        
-        for enseigne in enseignes:
-            try:
-                await asyncio.sleep(2)
-                log = await scrape_enseigne(enseigne, db, browser)
-                logs.append(log)
-            except Exception as e:
-                logger.error(f"Failed to scrape {enseigne.nom}: {e}")
-        
-        await browser.close()
+    async def scrape_one(enseigne: Enseigne) -> ScrapingLog:
+        async with semaphore:
+            with session_factory(expire_on_commit=False) as session:
+                return await scrape_enseigne(enseigne, session, context)
+    
+    try:
+        results = await asyncio.gather(*(scrape_one(e) for e in enseignes), return_exceptions=True)
+    finally:
+        await _close_context(context)
+    
+    logs = []
+    for enseigne, result in zip(enseignes, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to scrape {enseigne.nom}: {result}")
+            log = ScrapingLog(enseigne_id=enseigne.id, statut="error", message_erreur=str(result))
+            db.add(log)
+            logs.append(log)
+        else:
+            logs.append(result)
+    db.commit()
     
     logger.info(f"Scraping complete: {len(logs)} enseignes processed")
     return logs
@@ -12,19 +12,27 @@ Features:
 """
 
 import asyncio
+import json
 import logging
 import os
+import random
 import re
 import time
 from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
+from urllib.parse import urlsplit
 
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from app.core.search_config import (
     BROWSERLESS_URL,
+    CLOSE_POPUPS_SCRIPT,
+    STATIC_ASSET_URL_RE,
+    TRACKER_URL_RE,
     get_random_user_agent,
+    split_popup_selector,
 )
 
 logger = logging.getLogger(__name__)
@@ -74,6 +82,195 @@ POPUP_SELECTORS = [
 ]
 
 
+# Price patterns, compiled once
+_AMAZON_PRICE_RE = re.compile(r"(\d+)[.,](\d{2})")
+_STRICT_PRICE_RE = re.compile(r"(\d{1,4}(?:\s?\d{3})*[.,]\d{2})\s*€?")
+_FR_COMMA_RE = re.compile(r"(\d+),(\d{2})")
+# French prices ("12€99", "1 299,99 €") and thousands separators ("1 299") in one pass:
+# a price absorbs the thousands group in front of it, as the separate passes used to do
+_FR_PRICE_NORM_RE = re.compile(
+    r"(\d+)(?:\s(\d{3}))?(?:€(\d{2})\b|,(\d{2})(?:\s+€|€(?!\d{2}\b)))|(\d+)\s(\d{3})"
+)
+
+
+def _fr_price_norm_repl(match: re.Match) -> str:
+    units, thousands, eur_cents, comma_cents, head, tail = match.groups()
+    if units is None:
+        return head + tail
+    return f"{units}{thousands or ''}.{eur_cents or comma_cents} €"
+
+
+def normalize_french_prices(text: str) -> str:
+    """Rewrite "12€99" and "12,99 €" as "12.99 €" and drop thousands separators."""
+    return _FR_PRICE_NORM_RE.sub(_fr_price_norm_repl, text)
+
+
+# First strict price match (its first group) in the rendered body text, the text
+# inner_text("body") returns: inline pieces such as "12<sup>,99</sup> €" are joined and
+# hidden or script text is left out. Matched in the page so only the hit crosses CDP.
+FIND_PRICE_TEXT_SCRIPT = """
+(pattern) => {
+    const match = document.body.innerText.match(new RegExp(pattern));
+    return match ? match[1] : '';
+}
+"""
+
+# Text of the visible, not struck-through elements, same visibility rule as Playwright's is_visible()
+VISIBLE_PRICE_TEXTS_SCRIPT = """
+(elements) => elements.filter(el => {
+    const r = el.getBoundingClientRect();
+    if (!r.width || !r.height) return false;
+    const style = getComputedStyle(el);
+    return style.visibility !== 'hidden' && !style.textDecoration.includes('line-through');
+}).map(el => el.innerText)
+"""
+
+# Clip rectangle (viewport coordinates) of the first present selector, cut to the viewport,
+# so a focused screenshot is a single capture of what is on screen
+SCREENSHOT_AREA_SCRIPT = """
+(selectors) => {
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (!el) continue;
+        const r = el.getBoundingClientRect();
+        const x = Math.max(0, r.left);
+        const y = Math.max(0, r.top);
+        const width = Math.min(r.right, window.innerWidth) - x;
+        const height = Math.min(r.bottom, window.innerHeight) - y;
+        if (width > 0 && height > 0) return {selector, x, y, width, height};
+    }
+    return null;
+}
+"""
+
+# Amazon product page selectors: main price blocks by priority, price elements waited for
+# after load, and the product area used for the focused screenshot
+AMAZON_MAIN_PRICE_SELECTORS = (
+    "#corePriceDisplay_desktop_feature_div .a-price .a-offscreen",
+    "#corePrice_desktop .a-price .a-offscreen",
+    "#corePrice_feature_div .a-price .a-offscreen",
+    "#priceblock_ourprice",
+    "#priceblock_dealprice",
+    "#priceblock_saleprice",
+)
+AMAZON_PRICE_WAIT_SELECTORS = (".a-price .a-offscreen", "#corePriceDisplay_desktop_feature_div")
+AMAZON_SCREENSHOT_SELECTORS = ("#dp-container", "#ppd", "#centerCol")
+
+# Generic price selectors, by decreasing priority: semantic, site-specific classes, then generic
+GENERIC_PRICE_SELECTORS = (
+    "[itemprop='price']",
+    "[data-testid='price']",
+    "[data-test='price']",
+    "[data-price]",
+    ".current-price",
+    ".sale-price",
+    ".final-price",
+    ".product-price",
+    ".special-price",
+    ".price-current",
+    ".price-now",
+    ".prix-actuel",
+    "#price",
+    "#product-price",
+    "span[class*='prix']:not([class*='ancien']):not([class*='barre'])",
+    ".price:not(.old-price):not(.was-price)",
+    "[class*='price']:not([class*='old']):not([class*='was']):not([class*='original'])"
+    ":not([class*='before']):not([class*='strike']):not([class*='barre'])",
+)
+
+# Checks the first 3 matches of each price selector in priority order, in a single round trip:
+# visible, not struck through, strict price pattern, plausible value. Returns the first hit
+# as {selector, text, value}, or null.
+FIND_GENERIC_PRICE_SCRIPT = """
+([selectors, pattern]) => {
+    const re = new RegExp(pattern);
+    for (const selector of selectors) {
+        const elements = Array.from(document.querySelectorAll(selector)).slice(0, 3);
+        for (const el of elements) {
+            const r = el.getBoundingClientRect();
+            if (!r.width || !r.height) continue;
+            const style = getComputedStyle(el);
+            if (style.visibility === 'hidden' || style.textDecoration.includes('line-through')) continue;
+            const match = (el.innerText || '').match(re);
+            if (!match) continue;
+            const value = parseFloat(match[0].replace('€', '').replace(/\\s/g, '').replace(',', '.'));
+            if (value >= 0.01 && value <= 100000) return {selector, text: match[0], value};
+        }
+    }
+    return null;
+}
+"""
+
+POPUP_SELECTOR_PARTS = [split_popup_selector(selector) for selector in POPUP_SELECTORS]
+
+# Explicit accept/close controls only, for the in-page observer: the catch-alls of
+# POPUP_SELECTORS ("[class*='modal'] button", ...) could press variant or size-guide
+# buttons and change the page being priced, so they stay in the one-off _handle_popups pass
+POPUP_OBSERVER_SELECTORS = (
+    "button[aria-label='Close']",
+    "button[aria-label='close']",
+    "button[aria-label='Fermer']",
+    ".close-button",
+    ".modal-close",
+    ".popin-close",
+    ".js-modal-close",
+    "div[role='dialog'] button[aria-label='Close']",
+    "#sp-cc-accept",
+    "#onetrust-accept-btn-handler",
+    "input[aria-labelledby='sp-cc-accept-label']",
+    "input[value='Continuer les achats']",
+    "input[value='Continue shopping']",
+    "[aria-labelledby='continue-shopping-label']",
+)
+
+# Installed in every context: clicks POPUP_OBSERVER_SELECTORS as popups are added to the DOM
+# (checks are debounced, and the observer stops after a few clicks or 20s so it cannot fight the page)
+POPUP_OBSERVER_SCRIPT = f"""
+(() => {{
+    const closePopups = {CLOSE_POPUPS_SCRIPT.strip()};
+    const parts = {json.dumps([split_popup_selector(selector) for selector in POPUP_OBSERVER_SELECTORS])};
+    let scheduled = false;
+    let clicks = 0;
+    const observer = new MutationObserver(() => {{
+        if (scheduled) return;
+        scheduled = true;
+        setTimeout(run, 250);
+    }});
+    function run() {{
+        scheduled = false;
+        clicks += closePopups(parts).length;
+        if (clicks >= 10) observer.disconnect();
+    }}
+    const start = () => {{
+        observer.observe(document.documentElement, {{childList: true, subtree: true}});
+        run();
+    }};
+    if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', start);
+    else start();
+    setTimeout(() => observer.disconnect(), 20000);
+}})();
+"""
+
+# Warm browser contexts (each with its page) kept between fetches; a context is recycled after
+# CONTEXT_MAX_USES pages so per-context state (cookies, cache, driver objects) stays bounded
+CONTEXT_POOL_SIZE = int(os.getenv("BROWSERLESS_CONTEXT_POOL_SIZE", "4"))
+CONTEXT_MAX_USES = int(os.getenv("BROWSERLESS_CONTEXT_MAX_USES", "20"))
+# Concurrent fetches through the shared browser; bounds the number of live contexts
+MAX_CONCURRENT_PAGES = int(os.getenv("BROWSERLESS_CONCURRENCY", "8"))
+
+SCREENSHOTS_DIR = "screenshots"
+# Anything but letters and digits becomes "_" in screenshot file names
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"\W")
+
+
+def _url_origin(url: str) -> str:
+    """Origin ("https://host:port") of an http(s) URL, "" for about:blank, data: and the like."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return ""
+    return f"{parts.scheme}://{parts.netloc}"
+
+
 @dataclass
 class ScrapeConfig:
     """Configuration for scraping parameters."""
@@ -93,6 +290,13 @@ class BrowserlessService:
     _playwright = None
     _browser: Browser | None = None
     _lock = asyncio.Lock()
+    # LIFO so the most recently used page, the warmest one, is handed out first
+    _context_pool: asyncio.LifoQueue[tuple[BrowserContext, Page]] = asyncio.LifoQueue(maxsize=CONTEXT_POOL_SIZE)
+    _context_uses: ClassVar[dict[BrowserContext, int]] = {}
+    # Origins loaded in each pooled context (any frame), whose storage is cleared on release
+    _context_origins: ClassVar[dict[BrowserContext, set[str]]] = {}
+    _semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    _screenshots_dir_ready = False
 
     @classmethod
     async def initialize(cls):
@@ -127,6 +331,7 @@ class BrowserlessService:
     async def shutdown(cls):
         """Shutdown the shared browser instance."""
         async with cls._lock:
+            await cls._drain_context_pool()
             if cls._browser:
                 logger.info("Shutting down BrowserlessService shared browser...")
                 await cls._browser.close()
@@ -141,36 +346,39 @@ class BrowserlessService:
         """
         Ensure browser is connected, reconnect if needed.
         Returns True if browser is ready, False otherwise.
+
+        The lock is only taken to (re)connect, so concurrent fetches do not queue here.
         """
+        if cls._browser is not None and cls._browser.is_connected():
+            return True
+
         async with cls._lock:
             try:
+                # Another fetch may have reconnected while this one waited for the lock
+                if cls._browser is not None and cls._browser.is_connected():
+                    return True
+
                 if cls._browser is None:
                     logger.warning("Browser not initialized, initializing...")
                     await cls._initialize()
                     return cls._browser is not None
 
-                # Test if browser is still alive
-                try:
-                    test_context = await cls._browser.new_context()
-                    await test_context.close()
-                    logger.debug("✅ Browser connection test passed (reusing)")
-                    return True
-                except Exception as e:
-                    logger.error(f"❌ Browser connection test failed: {e}")
-                    logger.info("🔄 Attempting to reconnect...")
+                logger.error("❌ Browser disconnected")
+                logger.info("🔄 Attempting to reconnect...")
 
-                    # Clear the old browser
-                    cls._browser = None
-                    if cls._playwright:
-                        try:
-                            await cls._playwright.stop()
-                        except Exception:
-                            pass
-                        cls._playwright = None
+                # Clear the old browser (pooled contexts died with it)
+                await cls._drain_context_pool()
+                cls._browser = None
+                if cls._playwright:
+                    try:
+                        await cls._playwright.stop()
+                    except Exception:
+                        pass
+                    cls._playwright = None
 
-                    # Reconnect
-                    await cls._initialize()
-                    return cls._browser is not None
+                # Reconnect
+                await cls._initialize()
+                return cls._browser is not None
             except Exception as e:
                 logger.error(f"Failed to ensure browser connection: {e}")
                 return False
@@ -258,59 +466,167 @@ class BrowserlessService:
             Object.defineProperty(navigator, 'deviceMemory', { get: () => 8 });
         """)
 
-        await context.route("**/*", lambda route: route.continue_())
+        await context.add_init_script(POPUP_OBSERVER_SCRIPT)
+
+        await context.route(TRACKER_URL_RE, lambda route: route.abort())
 
         return context
 
+    @classmethod
+    async def _acquire_page(cls, use_proxy: bool = False) -> tuple[BrowserContext, Page]:
+        """Take a warm context and its page from the pool, or create them if the pool is empty."""
+        try:
+            return cls._context_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            context = await cls._create_context(cls._browser, use_proxy=use_proxy)
+            cls._context_uses[context] = 0
+            logger.debug(f"New browser context ({len(cls._context_uses)} live)")
+            try:
+                page = await context.new_page()
+            except Exception:
+                cls._forget_context(context)
+                await context.close()
+                raise
+            origins = cls._context_origins[context] = set()
+            page.on("framenavigated", lambda frame: origins.add(_url_origin(frame.url)))
+            return context, page
+
+    @classmethod
+    def _forget_context(cls, context: BrowserContext):
+        """Drop the bookkeeping of a closed context."""
+        cls._context_uses.pop(context, None)
+        cls._context_origins.pop(context, None)
+
+    @classmethod
+    async def _clear_visited_storage(cls, context: BrowserContext, page: Page):
+        """Clear every kind of storage (web storage, IndexedDB, cache storage, ...) of the origins visited."""
+        origins = cls._context_origins.get(context, set())
+        origins.discard("")
+        if not origins:
+            return
+        cdp = await context.new_cdp_session(page)
+        try:
+            await asyncio.gather(
+                *(
+                    cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                    for origin in origins
+                )
+            )
+        finally:
+            await cdp.detach()
+        origins.clear()
+
+    @classmethod
+    async def _release_page(cls, context: BrowserContext, page: Page, reusable: bool):
+        """Reset the page and return it to the pool with its context, or close the context if it is spent."""
+        uses = cls._context_uses.pop(context, CONTEXT_MAX_USES) + 1
+        try:
+            # Contexts of a browser dropped by a reconnection are not pooled again
+            if (
+                reusable
+                and uses < CONTEXT_MAX_USES
+                and context.browser is cls._browser
+                and not cls._context_pool.full()
+            ):
+                # Drop the per-fetch routes, unload the site and forget the storage, cookies
+                # and permissions of every origin visited instead of closing the page, so
+                # fetches stay isolated
+                await page.unroute_all(behavior="ignoreErrors")
+                await page.goto("about:blank")
+                await cls._clear_visited_storage(context, page)
+                await context.clear_cookies()
+                await context.clear_permissions()
+                cls._context_uses[context] = uses
+                cls._context_pool.put_nowait((context, page))
+                return
+        except Exception as e:
+            logger.debug(f"Discarding browser context: {e}")
+        cls._context_origins.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @classmethod
+    async def _drain_context_pool(cls):
+        """Close every pooled context."""
+        while not cls._context_pool.empty():
+            context, _ = cls._context_pool.get_nowait()
+            cls._forget_context(context)
+            try:
+                await context.close()
+            except Exception:
+                pass
+
     @staticmethod
-    async def _navigate_and_wait(page: Page, url: str, timeout: int):
-        """Navigate to URL and wait for page load."""
+    async def _navigate_and_wait(page: Page, url: str, timeout: int, settle: bool = True):
+        """
+        Navigate to URL and wait for page load.
+
+        settle=False returns at DOMContentLoaded, for callers that wait for the element they need.
+        """
         try:
             await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
             logger.info(f"✅ Page loaded (domcontentloaded): {url}")
+            if not settle:
+                return
 
             try:
-                await page.wait_for_load_state("networkidle", timeout=2000)
-                logger.info("✅ Network idle reached")
+                await page.wait_for_load_state("load", timeout=2000)
+                logger.info("✅ Load event reached")
             except PlaywrightTimeoutError:
-                logger.debug("⚠️ Network idle timed out (non-critical), proceeding...")
+                logger.debug("⚠️ Load event timed out (non-critical), proceeding...")
 
         except Exception as e:
             logger.warning(f"Navigation warning for {url}: {e}")
 
-        await page.wait_for_timeout(1500)
+        if settle:
+            await page.wait_for_timeout(1500)
+
+    @staticmethod
+    async def _wait_for_any_selector(page: Page, selectors: tuple[str, ...], timeout: int) -> str | None:
+        """Wait for the selectors concurrently; return the first one that became visible, if any."""
+        waits = {
+            asyncio.create_task(page.wait_for_selector(selector, timeout=timeout, state="visible")): selector
+            for selector in selectors
+        }
+        pending = set(waits)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return waits[task]
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let the cancelled waits finish so their errors are not reported as unhandled
+            await asyncio.gather(*pending, return_exceptions=True)
 
     @staticmethod
     async def _handle_popups(page: Page):
-        """Attempt to close popups and cookie banners with refined retry logic."""
+        """
+        Attempt to close popups and cookie banners with refined retry logic.
+
+        The in-page observer (POPUP_OBSERVER_SCRIPT) closes explicit accept/close controls
+        as they appear; this pass tries the full list, and stops after the first pass that
+        finds nothing.
+        """
         logger.debug("🛡️ Attempting to close popups...")
 
-        async def try_close(selector: str):
+        # Further passes only while popups keep appearing (animations, chained popups, etc.)
+        for _ in range(3):
+            # 1. Standard Selectors, all checked in one evaluate
             try:
-                # Check for multiple elements
-                locator = page.locator(selector)
-                count = await locator.count()
-                if count > 0:
-                    # Click the first visible and enabled one
-                    for i in range(count):
-                        el = locator.nth(i)
-                        if await el.is_visible() and await el.is_enabled():
-                            logger.info(f"🚫 Closing popup via selector: {selector}")
-                            await el.click(timeout=1000)
-                            return True
-            except Exception:
-                pass
-            return False
-
-        # Multiple passes to catch delayed popups (animations, etc.)
-        for pass_idx in range(3):
-            closed_something = False
-
-            # 1. Standard Selectors
-            for selector in POPUP_SELECTORS:
-                if await try_close(selector):
-                    closed_something = True
-                    await page.wait_for_timeout(500)  # Wait for animation
+                clicked = await page.evaluate(CLOSE_POPUPS_SCRIPT, POPUP_SELECTOR_PARTS)
+            except Exception as e:
+                logger.debug(f"Popup check failed: {e}")
+                clicked = []
+            closed_something = bool(clicked)
+            if closed_something:
+                logger.info(f"🚫 Closed popups via selectors: {clicked}")
+                await page.wait_for_timeout(500)  # Wait for animation
 
             # 2. Key presses (Escape)
             try:
@@ -319,20 +635,11 @@ class BrowserlessService:
             except Exception:
                 pass
 
-            # If we didn't find anything in this pass and it's not the first, break early
-            if not closed_something and pass_idx > 0:
+            if not closed_something:
                 break
 
             await page.wait_for_timeout(1000)  # Wait between passes
 
-        # Final check: Force click typical overlay backdrops (risky but effective)
-        try:
-            # Click coordinates (top-right or top-left corner often safish to close modals)
-            # await page.mouse.click(10, 10)
-            pass
-        except Exception:
-            pass
-
     @staticmethod
     async def _extract_amazon_price(page: Page) -> str:
         """
@@ -340,61 +647,37 @@ class BrowserlessService:
         Prioritize main price block to avoid false positives.
         """
         # Priority 1: Main price display area (most specific)
-        main_price_selectors = [
-            "#corePriceDisplay_desktop_feature_div .a-price .a-offscreen",
-            "#corePrice_desktop .a-price .a-offscreen",
-            "#corePrice_feature_div .a-price .a-offscreen",
-            "#priceblock_ourprice",
-            "#priceblock_dealprice",
-            "#priceblock_saleprice",
-        ]
-
-        for selector in main_price_selectors:
+        for selector in AMAZON_MAIN_PRICE_SELECTORS:
             try:
-                elements = page.locator(selector)
-                count = await elements.count()
-
-                for i in range(count):
-                    element = elements.nth(i)
-
-                    if not await element.is_visible(timeout=1000):
-                        continue
-
-                    # Check if strikethrough (old price)
-                    try:
-                        text_decoration = await element.evaluate("el => window.getComputedStyle(el).textDecoration")
-                        if "line-through" in text_decoration:
-                            continue
-                    except Exception:
-                        pass
+                # Visibility, strikethrough (old price) and text of every match in one call
+                price_texts = await page.locator(selector).evaluate_all(VISIBLE_PRICE_TEXTS_SCRIPT)
 
-                    price_text = await element.inner_text(timeout=1000)
+                for price_text in price_texts:
                     if price_text and price_text.strip():
-                        if re.search(r"\d+[.,]\d{2}", price_text):
-                            numeric_match = re.search(r"(\d+)[.,](\d{2})", price_text)
-                            if numeric_match:
-                                price_val = float(f"{numeric_match.group(1)}.{numeric_match.group(2)}")
-                                if 0.01 <= price_val <= 10000:
-                                    logger.info(f"💰 Amazon main price via {selector}: {price_text} ({price_val}€)")
-                                    return price_text.strip()
+                        numeric_match = _AMAZON_PRICE_RE.search(price_text)
+                        if numeric_match:
+                            price_val = float(f"{numeric_match.group(1)}.{numeric_match.group(2)}")
+                            if 0.01 <= price_val <= 10000:
+                                logger.info(f"💰 Amazon main price via {selector}: {price_text} ({price_val}€)")
+                                return price_text.strip()
             except Exception as e:
                 logger.debug(f"Selector {selector} failed: {e}")
                 continue
 
         # Priority 2: Buybox area
         try:
-            buybox = page.locator("#buybox, #buybox_feature_div, #desktop_buybox")
-            if await buybox.count() > 0:
-                price_elem = buybox.locator(".a-price .a-offscreen").first
-                if await price_elem.is_visible(timeout=1000):
-                    price_text = await price_elem.inner_text()
-                    if price_text and re.search(r"\d+[.,]\d{2}", price_text):
-                        numeric_match = re.search(r"(\d+)[.,](\d{2})", price_text)
-                        if numeric_match:
-                            price_val = float(f"{numeric_match.group(1)}.{numeric_match.group(2)}")
-                            if 0.01 <= price_val <= 10000:
-                                logger.info(f"💰 Amazon buybox price: {price_text} ({price_val}€)")
-                                return price_text.strip()
+            buybox_prices = page.locator("#buybox, #buybox_feature_div, #desktop_buybox").locator(
+                ".a-price .a-offscreen"
+            )
+            price_texts = await buybox_prices.evaluate_all(VISIBLE_PRICE_TEXTS_SCRIPT)
+            if price_texts:
+                price_text = price_texts[0]
+                numeric_match = _AMAZON_PRICE_RE.search(price_text)
+                if numeric_match:
+                    price_val = float(f"{numeric_match.group(1)}.{numeric_match.group(2)}")
+                    if 0.01 <= price_val <= 10000:
+                        logger.info(f"💰 Amazon buybox price: {price_text} ({price_val}€)")
+                        return price_text.strip()
         except Exception:
             pass
 
@@ -411,7 +694,7 @@ class BrowserlessService:
                 whole = whole.rstrip(".,")
                 price_text = f"{whole},{fraction}"
 
-                numeric_match = re.search(r"(\d+)[.,](\d{2})", price_text)
+                numeric_match = _AMAZON_PRICE_RE.search(price_text)
                 if numeric_match:
                     price_val = float(f"{numeric_match.group(1)}.{numeric_match.group(2)}")
                     if 0.01 <= price_val <= 10000:
@@ -426,106 +709,20 @@ class BrowserlessService:
     @staticmethod
     async def _extract_generic_price(page: Page) -> str:
         """Extract price from generic e-commerce pages with strict validation."""
-        # High-priority semantic selectors
-        high_priority_selectors = [
-            "[itemprop='price']",
-            "[data-testid='price']",
-            "[data-test='price']",
-            "[data-price]",
-        ]
-
-        # Medium-priority specific selectors
-        medium_priority_selectors = [
-            ".current-price",
-            ".sale-price",
-            ".final-price",
-            ".product-price",
-            ".special-price",
-            ".price-current",
-            ".price-now",
-            ".prix-actuel",
-            "#price",
-            "#product-price",
-        ]
-
-        # Low-priority generic selectors
-        low_priority_selectors = [
-            "span[class*='prix']:not([class*='ancien']):not([class*='barre'])",
-            ".price:not(.old-price):not(.was-price)",
-            "[class*='price']:not([class*='old']):not([class*='was']):not([class*='original']):not([class*='before']):not([class*='strike']):not([class*='barre'])",
-        ]
-
-        all_selectors = high_priority_selectors + medium_priority_selectors + low_priority_selectors
-        found_prices = []
-
-        # Strict French price regex
-        strict_price_regex = re.compile(r"(\d{1,4}(?:\s?\d{3})*[.,]\d{2})\s*€?")
-
-        for selector in all_selectors:
-            try:
-                elements = page.locator(selector)
-                count = await elements.count()
-
-                for i in range(min(count, 3)):
-                    try:
-                        element = elements.nth(i)
-
-                        if not await element.is_visible(timeout=1000):
-                            continue
-
-                        # Check if strikethrough
-                        try:
-                            text_decoration = await element.evaluate("el => window.getComputedStyle(el).textDecoration")
-                            if "line-through" in text_decoration:
-                                logger.debug(f"⏭️ Skipping strikethrough price at {selector}")
-                                continue
-                        except Exception:
-                            pass
-
-                        price_text = await element.inner_text()
-                        if not price_text:
-                            continue
-
-                        price_match = strict_price_regex.search(price_text)
-                        if price_match:
-                            matched_price = price_match.group(0)
-
-                            numeric_text = matched_price.replace("€", "").replace(" ", "").replace(",", ".")
-                            try:
-                                price_val = float(numeric_text)
-
-                                if 0.01 <= price_val <= 100000:
-                                    found_prices.append((selector, matched_price))
-                                    logger.info(f"💰 Valid price via {selector}: {matched_price} ({price_val}€)")
-
-                                    if selector in high_priority_selectors:
-                                        return matched_price
-                                else:
-                                    logger.debug(f"⏭️ Price out of range ({price_val}€): {matched_price}")
-                            except ValueError:
-                                logger.debug(f"⏭️ Could not parse price value: {matched_price}")
-                                continue
-
-                    except Exception as e:
-                        logger.debug(f"Error processing element {i} of {selector}: {e}")
-                        continue
-            except Exception as e:
-                logger.debug(f"Error with selector {selector}: {e}")
-                continue
+        try:
+            found = await page.evaluate(FIND_GENERIC_PRICE_SCRIPT, [GENERIC_PRICE_SELECTORS, _STRICT_PRICE_RE.pattern])
+        except Exception as e:
+            logger.debug(f"Price selectors check failed: {e}")
+            found = None
 
-        if found_prices:
-            best_price = found_prices[0][1]  # Take first (highest priority)
-            if len(found_prices) > 1:
-                prices_list = [p[1] for p in found_prices]
-                logger.info(f"💰 Multiple prices found: {prices_list}, selecting first: {best_price}")
-            return best_price
+        if found:
+            logger.info(f"💰 Valid price via {found['selector']}: {found['text']} ({found['value']}€)")
+            return found["text"]
 
         # Fallback: Strict regex in body text
         try:
-            all_text = await page.inner_text("body")
-            price_matches = strict_price_regex.findall(all_text)
-            if price_matches:
-                first_match = price_matches[0]
+            first_match = await page.evaluate(FIND_PRICE_TEXT_SCRIPT, _STRICT_PRICE_RE.pattern)
+            if first_match:
                 logger.info(f"💰 Found price via regex fallback: {first_match}")
                 return first_match
         except Exception as e:
@@ -534,6 +731,39 @@ class BrowserlessService:
         logger.warning("⚠️ Could not extract generic price with any method")
         return ""
 
+    @classmethod
+    async def _capture_screenshot(cls, page: Page, url: str, is_amazon_product: bool) -> str:
+        """Save a JPEG screenshot of the page and return its path."""
+        screenshot_path = ""
+        try:
+            if not cls._screenshots_dir_ready:
+                os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+                cls._screenshots_dir_ready = True
+            timestamp = time.time_ns() // 1_000_000
+            safe_name = _UNSAFE_FILENAME_CHARS_RE.sub("_", url.split("//")[-1][:50])
+            screenshot_path = f"{SCREENSHOTS_DIR}/{safe_name}_{timestamp}.jpg"
+
+            if is_amazon_product:
+                # Focused Amazon screenshot: the visible part of the product area
+                try:
+                    area = await page.evaluate(SCREENSHOT_AREA_SCRIPT, AMAZON_SCREENSHOT_SELECTORS)
+                except Exception:
+                    area = None
+                if area:
+                    selector = area.pop("selector")
+                    await page.screenshot(path=screenshot_path, clip=area, quality=80, type="jpeg")
+                    logger.info(f"📸 Amazon focused screenshot: {selector}")
+                else:
+                    await page.screenshot(path=screenshot_path, full_page=False, quality=80, type="jpeg")
+            else:
+                await page.screenshot(path=screenshot_path, full_page=False, quality=80, type="jpeg")
+                logger.info(f"📸 Viewport screenshot saved to {screenshot_path}")
+
+        except Exception as e:
+            logger.warning(f"Screenshot failed: {e}")
+
+        return screenshot_path
+
     @classmethod
     async def get_page_content(
         cls,
@@ -542,33 +772,76 @@ class BrowserlessService:
         wait_selector: str | None = None,
         extract_text: bool = False,
         retries: int = 3,
+        *,
+        block_resources: bool = False,
+        take_screenshot: bool = True,
     ) -> tuple[str, str]:
         """
         Fetch page content with persistent browser.
 
+        At most MAX_CONCURRENT_PAGES fetches run at once; other callers wait for a slot.
+        Pass block_resources=True when only the HTML is needed: images and fonts are not
+        downloaded (the screenshot is then incomplete). With take_screenshot=False no
+        screenshot is taken and the returned path is empty.
+
         Returns:
             tuple[content, screenshot_path]: Content (HTML or text) and screenshot path
         """
+        async with cls._semaphore:
+            return await cls._fetch_page_content(
+                url,
+                use_proxy=use_proxy,
+                wait_selector=wait_selector,
+                extract_text=extract_text,
+                retries=retries,
+                block_resources=block_resources,
+                take_screenshot=take_screenshot,
+            )
+
+    @classmethod
+    async def _fetch_page_content(
+        cls,
+        url: str,
+        *,
+        use_proxy: bool,
+        wait_selector: str | None,
+        extract_text: bool,
+        retries: int,
+        block_resources: bool,
+        take_screenshot: bool,
+    ) -> tuple[str, str]:
+        """Fetch page content (caller holds a concurrency slot)."""
         if not await cls._ensure_browser_connected():
             logger.error("❌ Failed to establish browser connection")
             return "", ""
 
+        # Site-specific handling is decided once: Amazon product pages get the dedicated
+        # price extractor and never run the generic selector scan
+        is_amazon = "amazon." in (urlsplit(url).hostname or "")
+        is_amazon_product = is_amazon and "/dp/" in url
+        extract_price = cls._extract_amazon_price if is_amazon_product else cls._extract_generic_price
+
         for attempt in range(retries):
             try:
-                context = await cls._create_context(cls._browser, use_proxy=use_proxy)
-                page = await context.new_page()
+                context, page = await cls._acquire_page(use_proxy=use_proxy)
+                # Only a context that served a clean page goes back to the pool
+                reusable = False
 
                 try:
-                    # Random human-like lead-in delay
-                    import random
+                    if block_resources:
+                        # Page-level route, removed before the page goes back to the pool
+                        await page.route(STATIC_ASSET_URL_RE, lambda route: route.abort())
 
+                    # Random human-like lead-in delay
                     await asyncio.sleep(random.uniform(0.5, 2.0))
 
-                    await cls._navigate_and_wait(page, url, 30000)
+                    # No generic settling when a selector wait below may confirm the content
+                    skip_settle = bool(wait_selector or is_amazon_product)
+                    await cls._navigate_and_wait(page, url, 30000, settle=not skip_settle)
                     await cls._handle_popups(page)
 
                     # Check for Amazon Captcha / Login Wall / Blocking
-                    if "amazon" in url.lower():
+                    if is_amazon:
                         content_check = await page.content()
                         is_blocked = (
                             "Type the characters you see in this image" in content_check
@@ -582,7 +855,6 @@ class BrowserlessService:
                         if is_blocked:
                             logger.warning(f"⚠️ Amazon Blocking/Login Wall detected (Attempt {attempt + 1}/{retries})")
                             if attempt < retries - 1:
-                                await context.close()
                                 # Exponential backoff with jitter
                                 await asyncio.sleep(2 * (attempt + 1) + random.uniform(0.5, 1.5))
                                 continue
@@ -590,16 +862,16 @@ class BrowserlessService:
                                 logger.error("❌ Amazon blocked all attempts")
                                 return "", ""
 
+                    # Every selector wait that runs has to resolve for the load wait to be skipped
+                    selector_resolved = True
+
                     # Amazon-specific wait for price or content
-                    if "amazon" in url.lower() and "/dp/" in url:
-                        amazon_selectors = [".a-price .a-offscreen", "#corePriceDisplay_desktop_feature_div"]
-                        for selector in amazon_selectors:
-                            try:
-                                await page.wait_for_selector(selector, timeout=5000, state="visible")
-                                logger.info(f"✅ Amazon price element found: {selector}")
-                                break
-                            except Exception:
-                                continue
+                    if is_amazon_product:
+                        selector = await cls._wait_for_any_selector(page, AMAZON_PRICE_WAIT_SELECTORS, 5000)
+                        if selector:
+                            logger.info(f"✅ Amazon price element found: {selector}")
+                        else:
+                            selector_resolved = False
 
                     # Generic wait selector
                     if wait_selector:
@@ -609,6 +881,14 @@ class BrowserlessService:
                             logger.info(f"✅ Wait selector found: {wait_selector}")
                         except Exception as e:
                             logger.warning(f"⚠️ Wait selector {wait_selector} timed out or failed: {e}")
+                            selector_resolved = False
+
+                    # The selectors did not confirm the content: wait for the load skipped above
+                    if skip_settle and not selector_resolved:
+                        try:
+                            await page.wait_for_load_state("load", timeout=2000)
+                        except PlaywrightTimeoutError:
+                            logger.debug("⚠️ Load event timed out (non-critical), proceeding...")
 
                     # Extract content
                     if extract_text:
@@ -616,19 +896,13 @@ class BrowserlessService:
                         logger.info(f"📄 Extracted {len(content)} chars of visible text")
 
                         # Normalize French prices
-                        content = re.sub(r"(\d+)€(\d{2})\b", r"\1.\2 €", content)
-                        content = re.sub(r"(\d+),(\d{2})\s*€", r"\1.\2 €", content)
-                        content = re.sub(r"(\d+)\s(\d{3})", r"\1\2", content)
+                        content = normalize_french_prices(content)
 
                         # Extract price
-                        extracted_price = ""
-                        if "amazon" in url.lower() and "/dp/" in url:
-                            extracted_price = await cls._extract_amazon_price(page)
-                        else:
-                            extracted_price = await cls._extract_generic_price(page)
+                        extracted_price = await extract_price(page)
 
                         if extracted_price:
-                            normalized_price = re.sub(r"(\d+),(\d{2})", r"\1.\2", extracted_price)
+                            normalized_price = _FR_COMMA_RE.sub(r"\1.\2", extracted_price)
                             normalized_price = normalized_price.replace(" ", "")
                             content = f"PRIX DÉTECTÉ: {normalized_price}\n\n{content}"
                             logger.info(f"💰 Prepended price: {normalized_price}")
@@ -638,40 +912,15 @@ class BrowserlessService:
                         content = await page.content()
                         logger.debug(f"📄 Extracted {len(content)} chars of HTML")
 
-                    # Take screenshot
                     screenshot_path = ""
-                    try:
-                        os.makedirs("screenshots", exist_ok=True)
-                        timestamp = int(time.time() * 1000)
-                        safe_name = "".join(c if c.isalnum() else "_" for c in url.split("//")[-1])[:50]
-                        screenshot_path = f"screenshots/{safe_name}_{timestamp}.jpg"
-
-                        is_amazon = "amazon" in url.lower() and "/dp/" in url
-
-                        if is_amazon:
-                            # Focused Amazon screenshot
-                            for selector in ["#dp-container", "#ppd", "#centerCol"]:
-                                try:
-                                    element = page.locator(selector).first
-                                    if await element.is_visible():
-                                        await element.screenshot(path=screenshot_path, quality=85, type="jpeg")
-                                        logger.info(f"📸 Amazon focused screenshot: {selector}")
-                                        break
-                                except Exception:
-                                    continue
-                            else:
-                                await page.screenshot(path=screenshot_path, full_page=False, quality=80, type="jpeg")
-                        else:
-                            await page.screenshot(path=screenshot_path, full_page=False, quality=80, type="jpeg")
-                            logger.info(f"📸 Viewport screenshot saved to {screenshot_path}")
-
-                    except Exception as e:
-                        logger.warning(f"Screenshot failed: {e}")
+                    if take_screenshot:
+                        screenshot_path = await cls._capture_screenshot(page, url, is_amazon_product)
 
+                    reusable = True
                     return content, screenshot_path
 
                 finally:
-                    await context.close()
+                    await cls._release_page(context, page, reusable)
 
             except Exception as e:
                 logger.error(f"❌ Error scraping {url} (Attempt {attempt + 1}): {e}")
@@ -18,7 +18,14 @@ from app.models import SearchSite
 from app.schemas import SearchProgress, SearchResultItem
 
 
-from app.core.search_config import SITE_CONFIGS, BROWSERLESS_URL
+from app.core.search_config import (
+    SITE_CONFIGS,
+    BROWSERLESS_URL,
+    CLOSE_POPUPS_SCRIPT,
+    STATIC_ASSET_URL_RE,
+    TRACKER_URL_RE,
+    split_popup_selector,
+)
 from app.services.ai_price_extractor import AIPriceExtractor
 
 logger = logging.getLogger(__name__)
@@ -32,6 +39,7 @@ COMMON_POPUP_SELECTORS = [
     "button[id*='accept']",
     "button[class*='accept']",
 ]
+COMMON_POPUP_SELECTOR_PARTS = [split_popup_selector(selector) for selector in COMMON_POPUP_SELECTORS]
 
 
 class SearchResult:
@@ -162,21 +170,22 @@ class ImprovedSearchService:
             window.chrome = { runtime: {} };
         """)
 
-        await context.route("**/*", lambda route: route.continue_())
+        # Results are parsed from the HTML: trackers, images and fonts are not needed
+        await context.route(TRACKER_URL_RE, lambda route: route.abort())
+        await context.route(STATIC_ASSET_URL_RE, lambda route: route.abort())
         return context
 
     @staticmethod
     async def _handle_popups(page: Page):
         """Close common popups/cookies"""
         logger.debug("Handling popups...")
-        for selector in COMMON_POPUP_SELECTORS:
-            try:
-                if await page.locator(selector).count() > 0:
-                    logger.debug(f"Found popup: {selector}")
-                    await page.locator(selector).first.click(timeout=2000)
-                    await page.wait_for_timeout(500)
-            except Exception:
-                pass
+        try:
+            clicked = await page.evaluate(CLOSE_POPUPS_SCRIPT, COMMON_POPUP_SELECTOR_PARTS)
+            if clicked:
+                logger.debug(f"Closed popups: {clicked}")
+                await page.wait_for_timeout(500)
+        except Exception:
+            pass
 
     @staticmethod
     def _parse_results(html: str, site_key: str, base_url: str, query: str) -> list[SearchResult]:
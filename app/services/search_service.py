@@ -20,6 +20,9 @@ from app.services.browserless_service import browserless_service
 
 logger = logging.getLogger(__name__)
 
+# Results carry the site display name as their source
+_SITE_CONFIGS_BY_NAME = {cfg["name"]: cfg for cfg in SITE_CONFIGS.values()}
+
 class SearchResult:
     def __init__(
         self,
@@ -71,7 +74,9 @@ class NewSearchService:
         html_content, _ = await browserless_service.get_page_content(
             search_url, 
             use_proxy=use_proxy,
-            wait_selector=config.get("wait_selector")
+            wait_selector=config.get("wait_selector"),
+            block_resources=True,  # Results are parsed from the HTML only
+            take_screenshot=False,
         )
 
         if not html_content:
@@ -85,13 +90,8 @@ class NewSearchService:
         """Scrape details for a single item"""
         try:
             # Determine if proxy is needed based on source config
-            config = SITE_CONFIGS.get(result.source) if result.source in SITE_CONFIGS else None
-            # Fallback: check if source name matches a config key
-            if not config:
-                for key, cfg in SITE_CONFIGS.items():
-                    if cfg["name"] == result.source:
-                        config = cfg
-                        break
+            # source is a config key or a site display name
+            config = SITE_CONFIGS.get(result.source) or _SITE_CONFIGS_BY_NAME.get(result.source)
             
             use_proxy = config.get("requires_proxy", False) if config else False
 
@@ -324,7 +324,9 @@ class NewSearchService:
         html_content, _ = await browserless_service.get_page_content(
             search_url, 
             use_proxy=use_proxy,
-            wait_selector=config.get("wait_selector")
+            wait_selector=config.get("wait_selector"),
+            block_resources=True,  # Results are parsed from the HTML only
+            take_screenshot=False,
         )
 
         if not html_content:
@@ -487,6 +489,9 @@ async def search_products(
     # 2. Map DB sites to Config keys
     site_keys = []
     for site in active_sites:
+        if site.domain in SITE_CONFIGS:
+            site_keys.append(site.domain)
+            continue
         for key in SITE_CONFIGS.keys():
             if key in site.domain or site.domain in key:
                 site_keys.append(key)
@@ -8,6 +8,8 @@ from datetime import datetime
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from app.core.search_config import CLOSE_POPUPS_SCRIPT, TRACKER_URL_RE, split_popup_selector
+
 logger = logging.getLogger(__name__)
 
 BROWSERLESS_URL = os.getenv("BROWSERLESS_URL", "ws://browserless:3000")
@@ -50,6 +52,7 @@ POPUP_SELECTORS = [
     "button[id*='accept']",
     "button[class*='accept']",
 ]
+POPUP_SELECTOR_PARTS = [split_popup_selector(selector) for selector in POPUP_SELECTORS]
 
 
 # Random User-Agents to alternate fingerprint
@@ -462,7 +465,8 @@ class ScraperService:
             );
         """)
 
-        await context.route("**/*", lambda route: route.continue_())
+        # Images stay loaded for the AI screenshots; only trackers are aborted
+        await context.route(TRACKER_URL_RE, lambda route: route.abort())
         return context
 
     @staticmethod
@@ -492,19 +496,14 @@ class ScraperService:
         # 1. Multi-pass clicking (some popups appear after others are closed)
         for i in range(2):
             logger.debug(f"Popup removal pass {i + 1}")
-            for selector in POPUP_SELECTORS:
-                try:
-                    locators = page.locator(selector)
-                    count = await locators.count()
-                    if count > 0:
-                        for j in range(count):
-                            target = locators.nth(j)
-                            if await target.is_visible():
-                                logger.info(f"Closing popup: {selector}")
-                                await target.click(timeout=1000)
-                                await page.wait_for_timeout(500)
-                except Exception:
-                    pass
+            # All selectors checked and clicked in one evaluate
+            try:
+                clicked = await page.evaluate(CLOSE_POPUPS_SCRIPT, POPUP_SELECTOR_PARTS)
+                if clicked:
+                    logger.info(f"Closed popups: {clicked}")
+                    await page.wait_for_timeout(500)
+            except Exception:
+                pass
 
             # Hammer Escape key
             try:
@@ -19,6 +19,12 @@ def _process_image(image_path: str) -> str:
     """
     try:
         with Image.open(image_path) as img:
+            # Screenshots are already JPEG: send them as they are unless they must be resized,
+            # a re-encode would only cost time and add compression artifacts
+            if img.format == "JPEG" and img.mode == "RGB" and max(img.size) <= MAX_IMAGE_SIZE:
+                with open(image_path, "rb") as f:
+                    return base64.b64encode(f.read()).decode("utf-8")
+
             # Resize if too large (e.g., max dimension 1024)
             if max(img.size) > MAX_IMAGE_SIZE:
                 img.thumbnail((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE))
@@ -0,0 +1,73 @@
+"""
+Unit tests for the Amazon search result parsing helpers.
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.services.amazon_scraper_service import parse_amazon_price, parse_rating, parse_reviews_count
+from app.services.amazon_scraper_v2 import CARD_STRAINER
+
+
+class TestParseAmazonPrice:
+    """Test French/English Amazon price strings."""
+
+    @pytest.mark.parametrize(
+        ("price_text", "expected"),
+        [
+            ("12,99 €", 12.99),
+            ("12,99€", 12.99),
+            ("12.99 EUR", 12.99),
+            ("1 234,99 €", 1234.99),
+            ("1\xa0234,99\xa0€", 1234.99),
+            ("  7,50 €\n", 7.5),
+            ("12,99 € - 15,99 €", 12.99),
+            ("42", 42.0),
+        ],
+    )
+    def test_valid_prices(self, price_text, expected):
+        """Test that common price formats are parsed."""
+        assert parse_amazon_price(price_text) == expected
+
+    @pytest.mark.parametrize("price_text", ["", None, "Prix indisponible", "nan", "inf"])
+    def test_invalid_prices(self, price_text):
+        """Test that texts without a number return None."""
+        assert parse_amazon_price(price_text) is None
+
+
+class TestParseRating:
+    """Test rating and review count parsing."""
+
+    def test_french_rating(self):
+        assert parse_rating("4,5 sur 5 étoiles") == 4.5
+
+    def test_english_rating(self):
+        assert parse_rating("4.2 out of 5 stars") == 4.2
+
+    def test_missing_rating(self):
+        assert parse_rating("") is None
+
+    def test_reviews_count(self):
+        assert parse_reviews_count("1\xa0234") == 1234
+        assert parse_reviews_count("(12,345)") == 12345
+
+
+class TestCardStrainer:
+    """Test that the strained search HTML still exposes nested cards."""
+
+    def test_nested_alternative_cards(self):
+        """Test that data-index cards inside an outer data-asin wrapper are found."""
+        html = """
+        <html><body>
+          <div data-asin="">
+            <div data-asin="B000000001" data-index="1"><h2>Un</h2></div>
+            <div data-asin="B000000002" data-index="2"><h2>Deux</h2></div>
+          </div>
+          <div class="ad" data-index="3"><h2>Pub</h2></div>
+        </body></html>
+        """
+        soup = BeautifulSoup(html, "lxml", parse_only=CARD_STRAINER)
+
+        cards = soup.find_all("div", {"data-asin": True, "data-index": True})
+
+        assert [card["data-asin"] for card in cards] == ["B000000001", "B000000002"]
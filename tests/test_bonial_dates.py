@@ -0,0 +1,101 @@
+"""
+Unit tests for Bonial catalog date parsing and hashing.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.bonial_scraper import compute_catalog_hash, parse_bonial_dates
+
+
+class TestParseBonialDates:
+    """Test the date formats shown on Bonial catalog cards."""
+
+    def test_range_with_year(self):
+        """Test a range where only the end date carries the year."""
+        dates = parse_bonial_dates("mar. 25/11 - lun. 08/12/2025")
+        assert datetime(2025, 12, 8) in dates
+        assert any(date.day == 25 and date.month == 11 for date in dates)
+
+    @pytest.mark.parametrize(
+        "date_str",
+        ["25/11 - 08/12/2025", "mar. 25/11 \u2013 lun. 08/12/25", "25-11 - 08-12-2025"],
+    )
+    def test_range_fast_path_variants(self, date_str):
+        """Test the separators and year widths accepted by the range fast path."""
+        assert parse_bonial_dates(date_str) == (datetime(2025, 11, 25), datetime(2025, 12, 8))
+
+    def test_range_across_new_year(self):
+        """Test that the start date of a range takes the year before when it wraps."""
+        debut, fin = parse_bonial_dates("29/12 - mar. 06/01/2026")
+        assert (debut, fin) == (datetime(2025, 12, 29), datetime(2026, 1, 6))
+
+    def test_full_dates(self):
+        """Test a range where both dates carry the year."""
+        debut, fin = parse_bonial_dates("du 01/02/2024 au 15/02/2024")
+        assert (debut, fin) == (datetime(2024, 2, 1), datetime(2024, 2, 15))
+
+    def test_dash_separator_and_short_year(self):
+        """Test dash separated dates and 2-digit years."""
+        debut, fin = parse_bonial_dates("01-03-24 15-03-24")
+        assert (debut, fin) == (datetime(2024, 3, 1), datetime(2024, 3, 15))
+
+    def test_dates_are_ordered(self):
+        """Test that the earliest date is always returned first."""
+        debut, fin = parse_bonial_dates("15/02/2024 01/02/2024")
+        assert debut < fin
+
+    def test_invalid_dates_are_skipped(self):
+        """Test that impossible dates are ignored."""
+        debut, fin = parse_bonial_dates("31/02/2024 - 10/03/2024")
+        assert debut == fin == datetime(2024, 3, 10)
+
+    def test_feb_29_depends_on_leap_year(self):
+        """Test that Feb 29 is only accepted in leap years."""
+        assert parse_bonial_dates("29/02/2024") == (datetime(2024, 2, 29), datetime(2024, 2, 29))
+        with pytest.raises(ValueError):
+            parse_bonial_dates("29/02/2023")
+
+    def test_range_uses_first_and_last_dates(self):
+        """Test that only the outer dates of a longer list bound the range."""
+        debut, fin = parse_bonial_dates("01/02/2024 05/02/2024 - 15/02/2024")
+        assert (debut, fin) == (datetime(2024, 2, 1), datetime(2024, 2, 15))
+
+    def test_single_future_date(self):
+        """Test that a single future date is used as the end of a range starting today."""
+        debut, fin = parse_bonial_dates("31-12-2099")
+        assert fin == datetime(2099, 12, 31)
+        assert debut <= datetime.now()
+
+    def test_yearless_dates_use_given_today(self):
+        """Test that yearless dates are resolved against the reference date passed in."""
+        today = datetime(2024, 11, 20)
+        assert parse_bonial_dates("18/11 - 24/11", today) == (datetime(2024, 11, 18), datetime(2024, 11, 24))
+        # Early-year dates seen in late autumn belong to the next year
+        assert parse_bonial_dates("02/01", today) == (today, datetime(2025, 1, 2))
+
+    def test_single_past_date(self):
+        """Test that a single past date is used as start and end."""
+        assert parse_bonial_dates("01/01/2020") == (datetime(2020, 1, 1), datetime(2020, 1, 1))
+
+    @pytest.mark.parametrize("date_str", ["", "Valable cette semaine", "99/99/2024"])
+    def test_no_valid_date(self, date_str):
+        """Test that strings without a valid date raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_bonial_dates(date_str)
+
+
+class TestComputeCatalogHash:
+    """Test the duplicate detection key."""
+
+    def test_stable(self):
+        date_debut = datetime(2024, 2, 1)
+        assert compute_catalog_hash(1, "Promo", date_debut) == compute_catalog_hash(1, "Promo", date_debut)
+
+    def test_depends_on_all_fields(self):
+        date_debut = datetime(2024, 2, 1)
+        reference = compute_catalog_hash(1, "Promo", date_debut)
+        assert compute_catalog_hash(2, "Promo", date_debut) != reference
+        assert compute_catalog_hash(1, "Autre", date_debut) != reference
+        assert compute_catalog_hash(1, "Promo", datetime(2024, 2, 2)) != reference
@@ -0,0 +1,197 @@
+"""
+Tests for the Bonial scraper persistence logic (browser calls are mocked).
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app import models
+from app.services import bonial_scraper
+
+
+def _catalog(titre: str) -> dict:
+    return {
+        "titre": titre,
+        "date_debut": datetime(2024, 2, 1),
+        "date_fin": datetime(2024, 2, 15),
+        "image_couverture_url": f"https://img.example.com/{titre}.jpg",
+        "catalogue_url": f"https://www.bonial.fr/contentViewer/{titre}",
+    }
+
+
+def _pages(count: int) -> list[dict]:
+    return [
+        {
+            "numero_page": i + 1,
+            "image_url": f"https://content-media.bonial.biz/{i}.jpg",
+            "largeur": 800,
+            "hauteur": 1100,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def enseigne(db):
+    enseigne = models.Enseigne(nom="Gifi", slug_bonial="Gifi", couleur="#E30613")
+    db.add(enseigne)
+    db.commit()
+    db.refresh(enseigne)
+    return enseigne
+
+
+@pytest.fixture
+def context():
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=AsyncMock())
+    return context
+
+
+@pytest.fixture
+def scraper():
+    """Patch the browser steps of scrape_enseigne; tests set the cards and pages they return."""
+    mocks = SimpleNamespace(catalog_list=AsyncMock(return_value=[]), catalog_pages=AsyncMock(return_value=[]))
+    with (
+        patch.object(bonial_scraper, "scrape_catalog_list", mocks.catalog_list),
+        patch.object(bonial_scraper, "scrape_catalog_pages", mocks.catalog_pages),
+        patch.object(bonial_scraper.asyncio, "sleep", AsyncMock()),
+    ):
+        yield mocks
+
+
+@pytest.mark.asyncio
+async def test_scrape_enseigne_saves_new_catalogs(db, enseigne, context, scraper):
+    scraper.catalog_list.return_value = [_catalog("promo-a"), _catalog("promo-b")]
+    scraper.catalog_pages.return_value = _pages(3)
+
+    log = await bonial_scraper.scrape_enseigne(enseigne, db, context)
+
+    assert log.statut == "success"
+    assert log.catalogues_trouves == 2
+    assert log.catalogues_nouveaux == 2
+    assert db.query(models.Catalogue).count() == 2
+    assert db.query(models.CataloguePage).count() == 6
+    assert db.query(models.ScrapingLog).count() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("hash_func", [bonial_scraper.compute_catalog_hash, bonial_scraper._legacy_catalog_hash])
+async def test_scrape_enseigne_skips_existing_catalogs(db, enseigne, context, scraper, hash_func):
+    existing = _catalog("promo-a")
+    db.add(
+        models.Catalogue(
+            enseigne_id=enseigne.id,
+            titre=existing["titre"],
+            date_debut=existing["date_debut"],
+            date_fin=existing["date_fin"],
+            image_couverture_url=existing["image_couverture_url"],
+            catalogue_url=existing["catalogue_url"],
+            content_hash=hash_func(enseigne.id, existing["titre"], existing["date_debut"]),
+        )
+    )
+    db.commit()
+
+    scraper.catalog_list.return_value = [_catalog("promo-a"), _catalog("promo-b")]
+    scraper.catalog_pages.return_value = _pages(2)
+
+    log = await bonial_scraper.scrape_enseigne(enseigne, db, context)
+
+    assert log.catalogues_nouveaux == 1
+    assert scraper.catalog_pages.await_count == 1
+    assert db.query(models.Catalogue).count() == 2
+    assert db.query(models.CataloguePage).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_scrape_enseigne_ignores_duplicate_cards(db, enseigne, context, scraper):
+    scraper.catalog_list.return_value = [_catalog("promo-a"), _catalog("promo-a")]
+    scraper.catalog_pages.return_value = _pages(1)
+
+    log = await bonial_scraper.scrape_enseigne(enseigne, db, context)
+
+    assert log.statut == "success"
+    assert log.catalogues_nouveaux == 1
+    assert db.query(models.Catalogue).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_scrape_enseigne_skips_known_viewer_url(db, enseigne, context, scraper):
+    """A catalog whose dates changed (e.g. fell back to "now") is matched by its viewer URL."""
+    known = _catalog("promo-a")
+    db.add(
+        models.Catalogue(
+            enseigne_id=enseigne.id,
+            titre=known["titre"],
+            date_debut=datetime(2024, 1, 1),
+            date_fin=datetime(2024, 1, 8),
+            image_couverture_url=known["image_couverture_url"],
+            catalogue_url=known["catalogue_url"],
+            content_hash="0" * 64,
+        )
+    )
+    db.commit()
+
+    scraper.catalog_list.return_value = [known]
+    scraper.catalog_pages.return_value = _pages(1)
+
+    log = await bonial_scraper.scrape_enseigne(enseigne, db, context)
+
+    assert log.catalogues_nouveaux == 0
+    assert db.query(models.Catalogue).count() == 1
+
+
+def test_parse_catalog_cards_from_server_html():
+    html = """
+    <html><body>
+      <section><h2>Restez informé</h2><a href="/contentViewer/newsletter">x</a><img src="/n.png"></section>
+      <div class="card">
+        <div><h2> Promo de Noël </h2></div>
+        <img src="//img.bonial.biz/cover.jpg">
+        <a href="/contentViewer/12345">Ouvrir le catalogue</a>
+        <span>mar. 25/11 - lun. 08/12/2025</span>
+      </div>
+    </body></html>
+    """
+    cards = bonial_scraper._parse_catalog_cards(html, "https://www.bonial.fr/Enseignes/Gifi")
+
+    assert cards == [
+        {
+            "title": "Promo de Noël",
+            "image": "https://img.bonial.biz/cover.jpg",
+            "url": "https://www.bonial.fr/contentViewer/12345",
+            "dates": ["25/11", "08/12/2025"],
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_per_host():
+    limiter = bonial_scraper.RateLimiter(min_interval=10)
+    sleep = AsyncMock()
+    with patch.object(bonial_scraper.asyncio, "sleep", sleep):
+        await limiter.wait("www.bonial.fr")
+        await limiter.wait("content-media.bonial.biz")
+        await limiter.wait("www.bonial.fr")
+
+    # Only the second request to the same host has to wait
+    assert sleep.await_count == 1
+    assert 9 < sleep.await_args.args[0] <= 10
+
+
+@pytest.mark.parametrize(
+    "url, blocked_on_list, blocked_on_viewer",
+    [
+        ("https://www.googletagmanager.com/gtm.js", True, True),
+        ("https://www.bonial.fr/static/app.css", True, True),
+        ("https://img.bonial.biz/cover.JPG?w=300", True, True),
+        ("https://content-media.bonial.biz/pages/1.jpg", True, False),
+        ("https://www.bonial.fr/static/app.js", False, False),
+        ("https://www.bonial.fr/api/brochures?image=cover.png", False, False),
+    ],
+)
+def test_blocked_url_patterns(url, blocked_on_list, blocked_on_viewer):
+    assert bool(bonial_scraper.LIST_BLOCKED_URL_RE.search(url)) is blocked_on_list
+    assert bool(bonial_scraper.VIEWER_BLOCKED_URL_RE.search(url)) is blocked_on_viewer
@@ -0,0 +1,65 @@
+"""
+Unit tests for the BrowserlessService price text helpers.
+"""
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from app.services.browserless_service import _STRICT_PRICE_RE, FIND_PRICE_TEXT_SCRIPT, normalize_french_prices
+
+
+class TestNormalizeFrenchPrices:
+    """Test the single-pass French price normalization."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("12€99", "12.99 €"),
+            ("12,99 €", "12.99 €"),
+            ("12,99€ TTC", "12.99 € TTC"),
+            ("1 299,99 €", "1299.99 €"),
+            ("1 299€99", "1299.99 €"),
+            ("1\xa0299,99\xa0€", "1299.99 €"),
+            ("12 345 ventes", "12345 ventes"),
+            ("1 000 000,00 €", "1000 000.00 €"),
+            ("5 1234,56 €", "51234.56 €"),
+            ("Livraison 4,99 € - Prix 19,90 €", "Livraison 4.99 € - Prix 19.90 €"),
+            ("3,12€99", "3,12.99 €"),
+            ("Réf. 12,5 cm", "Réf. 12,5 cm"),
+        ],
+    )
+    def test_matches_sequential_passes(self, text, expected):
+        """Test that the fused pattern gives the same result as the former three passes."""
+        assert normalize_french_prices(text) == expected
+
+
+@pytest.fixture
+async def page():
+    """A blank page in a local Chromium; skipped when no browser is installed."""
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(headless=True)
+        except PlaywrightError as e:
+            pytest.skip(f"Chromium not available: {e}")
+        yield await browser.new_page()
+        await browser.close()
+
+
+class TestFindPriceText:
+    """Test the in-page regex fallback of the generic price extraction."""
+
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ("<p>Prix : <strong>19,90 €</strong></p>", "19,90"),
+            ("<p>Prix : 12<sup>,99</sup> €</p>", "12,99"),
+            ("<p><span>12</span>,99 €</p>", "12,99"),
+            ("<p style='display:none'>5,00 €</p><p>7,50 €</p>", "7,50"),
+            ("<p>Aucun prix</p>", ""),
+        ],
+    )
+    async def test_matches_rendered_body_text(self, page, html, expected):
+        """Test that prices split across inline elements are found like inner_text("body")."""
+        await page.set_content(f"<body>{html}</body>")
+        assert await page.evaluate(FIND_PRICE_TEXT_SCRIPT, _STRICT_PRICE_RE.pattern) == expected